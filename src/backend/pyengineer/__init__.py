@@ -5,5 +5,6 @@ from .objects import Node
 from .objects import Section
 from .objects import Load
 from .objects import Support
+from .objects import Combination
 
-__all__ = ['Bar', 'Material', 'Node', 'Section', 'Load', 'Support']
+__all__ = ['Bar', 'Material', 'Node', 'Section', 'Load', 'Support', 'Combination']
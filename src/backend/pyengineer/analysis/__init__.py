@@ -1,4 +1,15 @@
 """Exportar"""
 from ._linear import Linear
+from ._results import Results
+from ._envelope import Envelope
+from ._member_response import MemberResponse
+from ._assembly import AssemblyPlan
+from ._element_cache import ElementCache, element_cache
+from ._factorization_cache import FactorizationCache, factorization_cache
+from ._solvers import Solver, DenseSolver, BandedCholeskySolver, SparseLUSolver, \
+    SparseCholeskySolver, ConjugateGradientSolver, LowRankUpdateSolver
 
-__all__ = ['Linear']
+__all__ = ['Linear', 'Results', 'Envelope', 'MemberResponse', 'AssemblyPlan',
+           'ElementCache', 'element_cache', 'FactorizationCache', 'factorization_cache',
+           'Solver', 'DenseSolver', 'BandedCholeskySolver', 'SparseLUSolver',
+           'SparseCholeskySolver', 'ConjugateGradientSolver', 'LowRankUpdateSolver']
@@ -0,0 +1,36 @@
+"""Helpers of the immutable arrays and name indexes of the results"""
+from types import MappingProxyType
+
+import numpy as np
+from numpy.typing import NDArray
+from numpy import float64
+
+
+def read_only(array: NDArray, dtype: type = float64) -> NDArray:
+    """Contiguous copy (or the same array) that can not be changed
+
+    Args:
+        array (NDArray): Array
+        dtype (type, optional): Type of the values. Defaults to float64.
+
+    Returns:
+        NDArray: Read-only array
+    """
+    array = np.ascontiguousarray(array, dtype=dtype)
+    array.flags.writeable = False
+    return array
+
+
+def first_index(names: list[str]) -> MappingProxyType[str, int]:
+    """Read-only index of the names, the first item with the name is used
+
+    Args:
+        names (list[str]): Names
+
+    Returns:
+        MappingProxyType[str, int]: Name -> index
+    """
+    indexes: dict[str, int] = {}
+    for index, name in enumerate(names):
+        indexes.setdefault(name, index)
+    return MappingProxyType(indexes)
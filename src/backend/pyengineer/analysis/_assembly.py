@@ -0,0 +1,149 @@
+"""Assembly plan of the stiffness matrix for a fixed topology"""
+import numpy as np
+from numpy.typing import NDArray
+from numpy import float64
+from scipy import sparse as sp # type: ignore
+
+
+class AssemblyPlan:
+    """Index arrays of the assembly of the global stiffness matrix
+
+    The plan depends only on the topology (spread vectors of the bars and fixed DOFs): the
+    sparsity pattern in CSR format, the position in the pattern of each term of the bar
+    matrices, the terms of the free block and the fill reducing permutation of the
+    factorization. Analyses of the same topology with other properties only sum the terms
+    (np.bincount) and factorize the new values.
+
+    Only the pattern and the permutation are reused, not a symbolic factorization: SciPy does
+    not expose the symbolic analysis of SuperLU, so each factorization still builds the
+    elimination tree and the structure of the factor. Reusing the permutation skips only the
+    minimum degree ordering.
+    """
+    matrix_order: int # Order of the global stiffness matrix
+    spread_vectors: NDArray[np.int64] # DOFs of each bar (nbars, 12)
+    free_dofs: NDArray[np.int64] # DOFs of the free block
+    keys: NDArray[np.int64] # Flat index (line · matrix_order + column) of the pattern terms
+    indptr: NDArray[np.int64] # CSR pointers of the lines of the pattern
+    indices: NDArray[np.int64] # CSR columns of the pattern
+    terms: NDArray[np.int64] # Pattern term of each term of the bar matrices (nbars · 144,)
+    diagonal: NDArray[np.int64] # Pattern term of the diagonal of each DOF
+    free_terms: NDArray[np.int64] # Pattern terms of the free block, in its CSR order
+    free_indptr: NDArray[np.int64] # CSR pointers of the lines of the free block
+    free_indices: NDArray[np.int64] # CSR columns of the free block
+    free_diagonal: NDArray[np.int64] # Free block term of the diagonal of each free DOF
+    permutation: NDArray[np.int64] | None # Fill reducing permutation, found by the first solver
+
+    def __init__(self, spread_vectors: NDArray[np.int64], matrix_order: int,
+                 free_dofs: NDArray[np.int64]):
+        """Assembly plan of the global stiffness matrix
+
+        Args:
+            spread_vectors (NDArray[np.int64]): DOFs of each bar (nbars, 12)
+            matrix_order (int): Order of the global stiffness matrix
+            free_dofs (NDArray[np.int64]): DOFs of the free block (sorted)
+        """
+        self.matrix_order = matrix_order
+        self.spread_vectors = np.array(spread_vectors, dtype=np.int64).reshape(-1, 12)
+        self.free_dofs = np.array(free_dofs, dtype=np.int64)
+        self.permutation = None
+
+        # Line and column of each term of the bar matrices, bar by bar, and the diagonal of
+        # every DOF (springs, penalty and nodes without bars)
+        rows = np.repeat(self.spread_vectors, 12, axis=1).ravel()
+        columns = np.tile(self.spread_vectors, (1, 12)).ravel()
+        dofs = np.arange(matrix_order, dtype=np.int64)
+        self.keys, inverse = np.unique(np.concatenate([rows * matrix_order + columns,
+                                                       dofs * matrix_order + dofs]),
+                                       return_inverse=True)
+        self.terms = inverse[:rows.size]
+        self.diagonal = inverse[rows.size:]
+
+        pattern_rows = self.keys // matrix_order
+        pattern_columns = self.keys % matrix_order
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(pattern_rows,
+                                                                 minlength=matrix_order))])
+        self.indices = pattern_columns
+
+        # Free block: the pattern terms with free line and column (still sorted by line)
+        free_index = np.full(matrix_order, -1, dtype=np.int64)
+        free_index[self.free_dofs] = np.arange(self.free_dofs.size)
+        free = (free_index[pattern_rows] >= 0) & (free_index[pattern_columns] >= 0)
+        self.free_terms = np.flatnonzero(free)
+        self.free_indptr = np.concatenate([[0], np.cumsum(np.bincount(
+            free_index[pattern_rows[free]], minlength=self.free_dofs.size))])
+        self.free_indices = free_index[pattern_columns[free]]
+
+        free_position = np.full(self.keys.size, -1, dtype=np.int64)
+        free_position[self.free_terms] = np.arange(self.free_terms.size)
+        self.free_diagonal = free_position[self.diagonal[self.free_dofs]]
+
+    def matches(self, spread_vectors: NDArray[np.int64], matrix_order: int,
+                free_dofs: NDArray[np.int64]) -> bool:
+        """Checks if the plan is of the topology
+
+        Args:
+            spread_vectors (NDArray[np.int64]): DOFs of each bar (nbars, 12)
+            matrix_order (int): Order of the global stiffness matrix
+            free_dofs (NDArray[np.int64]): DOFs of the free block
+
+        Returns:
+            bool: True if the plan can assemble the topology
+        """
+        return matrix_order == self.matrix_order and \
+            np.array_equal(spread_vectors, self.spread_vectors) and \
+            np.array_equal(free_dofs, self.free_dofs)
+
+    def assemble(self, klg: NDArray[float64]) -> NDArray[float64]:
+        """Sums the global matrices of the bars in the terms of the pattern
+
+        Args:
+            klg (NDArray[float64]): Global stiffness matrices of the bars (nbars, 12, 12)
+
+        Returns:
+            NDArray[float64]: Values of the pattern terms (CSR order)
+        """
+        # Float also without bars (np.bincount of nothing is int)
+        return np.asarray(np.bincount(self.terms, weights=np.ravel(klg),
+                                      minlength=self.keys.size), dtype=float64)
+
+    def to_sparse(self, values: NDArray[float64]) -> sp.csr_matrix:
+        """Global stiffness matrix in CSR format
+
+        Args:
+            values (NDArray[float64]): Values of the pattern terms
+
+        Returns:
+            sp.csr_matrix: Global stiffness matrix
+        """
+        return sp.csr_matrix((values, self.indices, self.indptr),
+                             shape=(self.matrix_order, self.matrix_order))
+
+    def to_dense(self, values: NDArray[float64]) -> NDArray[float64]:
+        """Global stiffness matrix in dense format
+
+        Args:
+            values (NDArray[float64]): Values of the pattern terms
+
+        Returns:
+            NDArray[float64]: Global stiffness matrix
+        """
+        matrix = np.zeros(self.matrix_order * self.matrix_order)
+        matrix[self.keys] = values
+        return matrix.reshape(self.matrix_order, self.matrix_order)
+
+    def free_block(self, values: NDArray[float64],
+                   diagonal: NDArray[float64]) -> sp.csr_matrix:
+        """Free block of the global stiffness matrix in CSR format
+
+        Args:
+            values (NDArray[float64]): Values of the pattern terms
+            diagonal (NDArray[float64]): Values added to the diagonal of every DOF (springs and
+                penalty), (matrix_order,)
+
+        Returns:
+            sp.csr_matrix: Free block with the diagonal added
+        """
+        free_values = values[self.free_terms]
+        free_values[self.free_diagonal] += diagonal[self.free_dofs]
+        return sp.csr_matrix((free_values, self.free_indices, self.free_indptr),
+                             shape=(self.free_dofs.size, self.free_dofs.size))
@@ -0,0 +1,142 @@
+"""Cache of the local stiffness matrices of the bars keyed by the content of the bar"""
+from collections import OrderedDict
+from threading import Lock
+
+import numpy as np
+from numpy.typing import NDArray
+from numpy import float64
+
+from ..objects import Bar
+from ..functions.engineering import stiffness
+
+# Columns of the signature: length, area, Ix, Iy, Iz, E, G and the 12 releases
+SIGNATURE_SIZE = 19
+
+
+def bars_signatures(bars: list[Bar]) -> NDArray[float64]:
+    """Signatures of the bars: every value that defines the local stiffness matrices
+
+    Args:
+        bars (list[Bar]): Bars
+
+    Returns:
+        NDArray[float64]: Signatures (nbars, SIGNATURE_SIZE)
+    """
+    signatures = np.array([[bar.length,
+                            bar.section.properties['area'],
+                            bar.section.properties['Ix'],
+                            bar.section.properties['Iy'],
+                            bar.section.properties['Iz'],
+                            bar.material.properties['E'],
+                            bar.material.properties['G'],
+                            *bar.release_mask] for bar in bars], dtype=float64)
+
+    return signatures.reshape(-1, SIGNATURE_SIZE)
+
+
+def element_matrices(signatures: NDArray[float64]) -> tuple[NDArray[float64],
+                                                             NDArray[float64],
+                                                             NDArray[float64]]:
+    """Local stiffness matrices of the signatures
+
+    Args:
+        signatures (NDArray[float64]): Signatures of the bars (nbars, SIGNATURE_SIZE)
+
+    Returns:
+        tuple[NDArray[float64], NDArray[float64], NDArray[float64]]: Local stiffness without
+            releases, condensation operators and local stiffness with releases (nbars, 12, 12)
+    """
+    signatures = np.asarray(signatures, dtype=float64).reshape(-1, SIGNATURE_SIZE)
+    releases = signatures[:, 7:].astype(bool)
+
+    kl_nr = stiffness.local_stiffness(*signatures[:, :7].T)
+    condensation = stiffness.condensation(kl_nr, releases)
+    kl = stiffness.condense(kl_nr, condensation, releases)
+
+    return kl_nr, condensation, kl
+
+
+class ElementCache:
+    """Least recently used cache of the local stiffness matrices
+
+    Bars with the same signature (length, section, material and releases) share the matrices,
+    so regular frames and new analyses of the same model calculate each signature only once.
+    The entries are read and changed under a lock, so analyses in other threads can share the
+    cache; the missing matrices are calculated outside the lock.
+    """
+    max_size: int # Maximum number of signatures stored
+    hits: int # Bars whose matrices were found in the cache
+    misses: int # Bars whose matrices were calculated
+
+    def __init__(self, max_size: int = 4096):
+        """Least recently used cache of the local stiffness matrices
+
+        Args:
+            max_size (int, optional): Maximum number of signatures stored. Defaults to 4096.
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.entries: OrderedDict[bytes, NDArray[float64]] = OrderedDict()
+        self.lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def clear(self) -> None:
+        """Remove all the matrices and reset the counters"""
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get(self, signatures: NDArray[float64]) -> tuple[NDArray[float64],
+                                                          NDArray[float64],
+                                                          NDArray[float64]]:
+        """Local stiffness matrices of the signatures, calculating only the missing ones
+
+        Args:
+            signatures (NDArray[float64]): Signatures of the bars (nbars, SIGNATURE_SIZE)
+
+        Returns:
+            tuple[NDArray[float64], NDArray[float64], NDArray[float64]]: Local stiffness without
+                releases, condensation operators and local stiffness with releases
+                (nbars, 12, 12)
+        """
+        signatures = np.asarray(signatures, dtype=float64).reshape(-1, SIGNATURE_SIZE)
+        unique, inverse = np.unique(signatures, axis=0, return_inverse=True)
+        keys = [signature.tobytes() for signature in unique]
+
+        bars_by_key = np.bincount(inverse.ravel(), minlength=len(keys))
+
+        # Matrices found in the cache, copied under the lock (another thread may remove them)
+        matrices = np.empty([3, len(keys), 12, 12])
+        with self.lock:
+            missing = []
+            for index, key in enumerate(keys):
+                if key in self.entries:
+                    self.entries.move_to_end(key)
+                    matrices[:, index] = self.entries[key]
+                else:
+                    missing.append(index)
+
+        # The missing ones are calculated without holding the other analyses
+        if missing:
+            matrices[:, missing] = element_matrices(unique[missing])
+
+        with self.lock:
+            for index in missing:
+                self.entries[keys[index]] = matrices[:, index].copy()
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+            misses = int(bars_by_key[missing].sum())
+            self.misses += misses
+            self.hits += signatures.shape[0] - misses
+
+        matrices = matrices[:, inverse.ravel()]
+        return matrices[0], matrices[1], matrices[2]
+
+
+# Cache shared by the analyses
+element_cache = ElementCache()
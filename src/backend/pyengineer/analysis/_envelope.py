@@ -0,0 +1,151 @@
+"""Envelopes (maximum and minimum) of the results over the load cases or the combinations"""
+from __future__ import annotations
+
+from types import MappingProxyType
+
+import numpy as np
+from numpy.typing import NDArray
+from numpy import float64
+
+from ..objects import Combination
+from ._arrays import read_only
+from ._results import Results, combination_factors
+
+# Values of a chunk of combined results (about 32 MB), used when chunk_size is not given
+CHUNK_VALUES = 4_000_000
+
+
+class Envelope:
+    """Immutable envelope of the results
+
+    Every array has the maximum in the index 0 and the minimum in the index 1 of the first
+    axis, and the "cases" arrays have the index (in cases_names) of the load case or
+    combination that governs each value. The combinations are streamed in chunks, so the peak
+    memory does not grow with the number of combinations.
+    """
+    cases_names: tuple[str, ...] # Names of the load cases or combinations of the envelope
+    nodes_names: tuple[str, ...] # Names of the nodes in the order of the arrays
+    bars_names: tuple[str, ...] # Names of the bars in the order of the arrays
+    displacements: NDArray[float64] # Maximum and minimum displacements (2, len(nodes), 6)
+    displacements_cases: NDArray[np.int64] # Governing case of each value (2, len(nodes), 6)
+    reactions: NDArray[float64] # Maximum and minimum reactions (2, len(nodes), 6)
+    reactions_cases: NDArray[np.int64] # Governing case of each value (2, len(nodes), 6)
+    bars_forces: NDArray[float64] # Maximum and minimum end forces (2, len(bars), 12)
+    bars_forces_cases: NDArray[np.int64] # Governing case of each value (2, len(bars), 12)
+    node_index: MappingProxyType[str, int] # Name of the node -> index
+    bar_index: MappingProxyType[str, int] # Name of the bar -> index
+
+    def __init__(self, results: Results, combinations: list[Combination] | None = None,
+                 chunk_size: int | None = None):
+        """Immutable envelope of the results
+
+        Args:
+            results (Results): Results of the load cases
+            combinations (list[Combination] | None, optional): Combinations of the envelope.
+                None uses the load cases of the results. Defaults to None.
+            chunk_size (int | None, optional): Number of combinations combined at once. None
+                uses CHUNK_VALUES values by chunk. Defaults to None.
+
+        Raises:
+            ValueError: If there is no load case or combination
+        """
+        nloads = len(results.loads_names)
+        if combinations is None:
+            factors = None
+            self.cases_names = results.loads_names
+        else:
+            factors = combination_factors(combinations, results.loads_names)
+            self.cases_names = tuple(combination.name for combination in combinations)
+        if not self.cases_names:
+            raise ValueError('The envelope needs at least one load case or combination')
+
+        self.nodes_names = results.nodes_names
+        self.bars_names = results.bars_names
+
+        # All the results of a load case in one line
+        arrays = (results.displacements, results.reactions, results.bars_forces)
+        values = np.concatenate([array.reshape(nloads, -1) for array in arrays], axis=1)
+        ncases = len(self.cases_names)
+        if chunk_size is None:
+            chunk_size = max(1, CHUNK_VALUES // max(1, values.shape[1]))
+
+        columns = np.arange(values.shape[1])
+        extremes = np.empty([2, values.shape[1]])
+        cases = np.zeros([2, values.shape[1]], dtype=np.int64)
+        for start in range(0, ncases, chunk_size):
+            stop = min(start + chunk_size, ncases)
+            chunk = values[start:stop] if factors is None else factors[start:stop] @ values
+
+            for index, arg in enumerate((np.argmax, np.argmin)):
+                chunk_cases = arg(chunk, axis=0)
+                chunk_extremes = chunk[chunk_cases, columns]
+                if start == 0:
+                    update = np.ones(values.shape[1], dtype=bool)
+                elif index == 0:
+                    update = chunk_extremes > extremes[0] # The first case governs the ties
+                else:
+                    update = chunk_extremes < extremes[1]
+                extremes[index, update] = chunk_extremes[update]
+                cases[index, update] = chunk_cases[update] + start
+
+        # Back to the shapes of the results
+        sizes = np.cumsum([array[0].size for array in arrays])[:-1]
+        shapes = [(2, *array.shape[1:]) for array in arrays]
+        extremes_arrays = [part.reshape(shape)
+                           for part, shape in zip(np.split(extremes, sizes, axis=1), shapes)]
+        cases_arrays = [part.reshape(shape)
+                        for part, shape in zip(np.split(cases, sizes, axis=1), shapes)]
+
+        self.displacements, self.reactions, self.bars_forces = \
+            [read_only(array) for array in extremes_arrays]
+        self.displacements_cases, self.reactions_cases, self.bars_forces_cases = \
+            [read_only(array, np.int64) for array in cases_arrays]
+        self.node_index = results.node_index
+        self.bar_index = results.bar_index
+
+    def get_displacements(self, node_name: str) -> tuple[NDArray[float64], NDArray[float64],
+                                                         list[str], list[str]]:
+        """Envelope of the displacements of the node
+
+        Args:
+            node_name (str): Name of the node
+
+        Returns:
+            tuple[NDArray[float64], NDArray[float64], list[str], list[str]]: Maximum and
+                minimum displacements (6,) and the names of the governing cases
+        """
+        return self._get(self.displacements, self.displacements_cases,
+                         self.node_index[node_name])
+
+    def get_reactions(self, node_name: str) -> tuple[NDArray[float64], NDArray[float64],
+                                                     list[str], list[str]]:
+        """Envelope of the reactions of the node
+
+        Args:
+            node_name (str): Name of the node
+
+        Returns:
+            tuple[NDArray[float64], NDArray[float64], list[str], list[str]]: Maximum and
+                minimum reactions (6,) and the names of the governing cases
+        """
+        return self._get(self.reactions, self.reactions_cases, self.node_index[node_name])
+
+    def get_bar_forces(self, bar_name: str) -> tuple[NDArray[float64], NDArray[float64],
+                                                     list[str], list[str]]:
+        """Envelope of the end forces of the bar
+
+        Args:
+            bar_name (str): Name of the bar
+
+        Returns:
+            tuple[NDArray[float64], NDArray[float64], list[str], list[str]]: Maximum and
+                minimum end forces in local coordinates (12,) and the names of the governing
+                cases
+        """
+        return self._get(self.bars_forces, self.bars_forces_cases, self.bar_index[bar_name])
+
+    def _get(self, extremes: NDArray[float64], cases: NDArray[np.int64],
+             index: int) -> tuple[NDArray[float64], NDArray[float64], list[str], list[str]]:
+        return (extremes[0, index], extremes[1, index],
+                [self.cases_names[case] for case in cases[0, index]],
+                [self.cases_names[case] for case in cases[1, index]])
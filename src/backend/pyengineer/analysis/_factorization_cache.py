@@ -0,0 +1,138 @@
+"""Cache of the factorized stiffness of the structures for analyses that change only the loads"""
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable
+
+import numpy as np
+from scipy import sparse as sp # type: ignore
+
+# Bytes of a nonzero of a sparse factor (value and index)
+FACTOR_NONZERO_BYTES = 12
+
+
+def nbytes(value: Any, seen: set[int] | None = None) -> int:
+    """Estimate of the memory of the arrays held by a value
+
+    Counts NumPy arrays, SciPy sparse matrices, SuperLU factors (by their nonzeros) and the
+    arrays inside containers, objects (solvers) and closures (preconditioners). Each object is
+    counted only once.
+
+    Args:
+        value (Any): Value
+        seen (set[int] | None, optional): Ids of the objects already counted. Defaults to None.
+
+    Returns:
+        int: Bytes
+    """
+    seen = set() if seen is None else seen
+    if id(value) in seen or value is None or isinstance(value, (str, bytes, int, float)):
+        return 0
+    seen.add(id(value))
+
+    if isinstance(value, np.ndarray):
+        return value.nbytes if value.base is None else nbytes(value.base, seen)
+    if sp.issparse(value):
+        return sum(nbytes(getattr(value, name, None), seen)
+                   for name in ('data', 'indices', 'indptr', 'row', 'col', 'offsets'))
+    if isinstance(value, dict):
+        return sum(nbytes(item, seen) for item in value.values())
+    if isinstance(value, (list, tuple, set)):
+        return sum(nbytes(item, seen) for item in value)
+    if hasattr(value, 'nnz'): # SuperLU factor
+        return int(value.nnz) * FACTOR_NONZERO_BYTES
+    if callable(value) and hasattr(value, '__closure__'):
+        return sum(nbytes(cell.cell_contents, seen) for cell in value.__closure__ or ())
+    if hasattr(value, '__dict__'):
+        return nbytes(vars(value), seen)
+    return 0
+
+
+class FactorizationCache:
+    """Least recently used cache of the assembled and factorized stiffness
+
+    Each entry keeps the matrices of the bars, the global stiffness, the partition of the DOFs
+    and the factorized solver of a structure, so a new analysis with the same key (same
+    stiffness, other loads) costs only the loads vector and a back-substitution. The entries
+    are limited in number and in memory (estimated by nbytes), and are changed under a lock,
+    so analyses in other threads can share the cache. The arrays of the entries are only read
+    by the analyses; each analysis solves with its own copy of the solver.
+    """
+    max_size: int # Maximum number of structures stored
+    max_bytes: int # Maximum memory of the structures stored
+    size_bytes: int # Memory of the structures stored
+    hits: int # Analyses that reused a factorization
+    misses: int # Analyses that factorized
+
+    def __init__(self, max_size: int = 8, max_bytes: int = 512 * 2**20):
+        """Least recently used cache of the assembled and factorized stiffness
+
+        Args:
+            max_size (int, optional): Maximum number of structures stored. Defaults to 8.
+            max_bytes (int, optional): Maximum memory of the structures stored; a larger
+                factorization is not stored. Defaults to 512 MiB.
+        """
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.entries: OrderedDict[Hashable, dict[str, Any]] = OrderedDict()
+        self.entries_bytes: dict[Hashable, int] = {}
+        self.lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def clear(self) -> None:
+        """Remove all the factorizations and reset the counters"""
+        with self.lock:
+            self.entries.clear()
+            self.entries_bytes.clear()
+            self.size_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def get(self, key: Hashable) -> dict[str, Any] | None:
+        """Factorization of the structure
+
+        Args:
+            key (Hashable): Key of the stiffness of the structure
+
+        Returns:
+            dict[str, Any] | None: Attributes of the analysis with the factorization; None if
+                the key is not in the cache
+        """
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def put(self, key: Hashable, factorization: dict[str, Any]) -> None:
+        """Stores the factorization of the structure, removing the least recently used
+
+        Args:
+            key (Hashable): Key of the stiffness of the structure
+            factorization (dict[str, Any]): Attributes of the analysis with the factorization
+        """
+        size = nbytes(factorization) # Outside the lock, it walks all the arrays
+        with self.lock:
+            self.size_bytes -= self.entries_bytes.pop(key, 0)
+            self.entries.pop(key, None)
+            if size > self.max_bytes:
+                return
+
+            self.entries[key] = factorization
+            self.entries_bytes[key] = size
+            self.size_bytes += size
+
+            while len(self.entries) > self.max_size or self.size_bytes > self.max_bytes:
+                removed, _ = self.entries.popitem(last=False)
+                self.size_bytes -= self.entries_bytes.pop(removed)
+
+
+# Cache shared by the analyses
+factorization_cache = FactorizationCache()
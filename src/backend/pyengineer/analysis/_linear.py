@@ -1,20 +1,55 @@
 """Faz a análise linear da estrutura"""
+from __future__ import annotations
+
+from typing import Hashable, Literal
+
 import numpy as np
 from numpy.typing import NDArray
 from numpy import float64
+from scipy import sparse as sp # type: ignore
 
 from ..objects import Node
 from ..objects import Bar
 from ..objects import Load
 from ..objects import Support
+from ..objects import Combination
+from ..objects._bar import bars_loads_columns, bars_loads_vectors
 
+from ..functions.engineering import rotation, stiffness
+from ..functions.engineering.efforts import deflections as efforts_deflections
+from ..functions.engineering.efforts import diagrams as efforts_diagrams
 from ..utils import is_number
 
+from ._results import Results
+from ._envelope import Envelope
+from ._member_response import MemberResponse
+from ._element_cache import ElementCache, bars_signatures, element_cache, element_matrices
+from ._factorization_cache import FactorizationCache, \
+    factorization_cache as shared_factorization_cache
+from ._solvers import SOLVERS, LowRankUpdateSolver, Solver, SolverType, matrix_difference, \
+    select_solver
+from ._assembly import AssemblyPlan
+from ._renumbering import bandwidth_profile, reverse_cuthill_mckee_numbering
+
+# Matrix order from which the global stiffness matrix is assembled in sparse format
+SPARSE_MIN_ORDER = 600
+# Changed equations up to which an update of the factorization is used instead of refactorizing
+MAX_UPDATE_RANK = 96
+# Attributes that depend only on the stiffness of the structure (kept by FactorizationCache)
+FACTORIZATION_ATTRIBUTES = ('kl_nr', 'condensation', 'kl', 'r3', 'klg', '_kg_internal',
+                            'kg_solution', 'free_dofs', 'fixed_dofs', 'solver')
+
 
 class Linear:
     """Análise linear"""
     def __init__(self, nodes: list[Node], bars: list[Bar],
-                 loads: list[Load], supports: Support, calculate: bool = True):
+                 loads: list[Load], supports: Support, calculate: bool = True,
+                 sparse: bool | None = None, solver: SolverType | Solver = 'auto',
+                 partitioned: bool = True, cache: ElementCache | None = element_cache,
+                 renumber: bool = True, structure_key: Hashable | None = None,
+                 factorization_cache: FactorizationCache | None = shared_factorization_cache,
+                 update_from: Linear | None = None, max_update_rank: int = MAX_UPDATE_RANK,
+                 plan: AssemblyPlan | None = None):
         """Construtor
 
         Args:
@@ -22,54 +57,282 @@ class Linear:
             bars (list[Bar]): Barras
             loads (list[Load]): Casos de carga
             supports (Support): Apoios
+            calculate (bool, optional): Calcula a estrutura na construção. Defaults to True.
+            sparse (bool | None, optional): Monta a matriz de rigidez global em formato esparso.
+                None escolhe pelo tamanho do modelo (SPARSE_MIN_ORDER). Defaults to None.
+            solver (SolverType | Solver, optional): Solver do sistema ('dense', 'banded',
+                'sparse_lu', 'sparse_cholesky', 'pcg' ou instância de Solver). 'auto' escolhe pela
+                ordem e esparsidade da matriz. O solver usado fica em self.solver; para configurar
+                o gradiente conjugado use uma instância de ConjugateGradientSolver.
+                Defaults to 'auto'.
+            partitioned (bool, optional): Elimina os graus de liberdade fixos e resolve apenas
+                o bloco livre. False usa a penalidade 1e25 na diagonal (não permitido com solvers
+                iterativos). Defaults to True.
+            cache (ElementCache | None, optional): Cache das matrizes locais das barras pela
+                assinatura (comprimento, seção, material e liberações). None calcula todas as
+                barras. Defaults to element_cache (compartilhado entre as análises).
+            renumber (bool, optional): Renumera os nós pelo Cuthill-McKee reverso antes da
+                montagem, reduzindo a largura de banda e o perfil da matriz. Os resultados voltam
+                na ordem dos nós do usuário. Defaults to True.
+            structure_key (Hashable | None, optional): Chave da rigidez da estrutura (nós,
+                barras, seções, materiais, apoios e liberações). Análises com a mesma chave e as
+                mesmas opções reutilizam a fatoração do factorization_cache e calculam apenas as
+                cargas. None sempre fatora. Defaults to None.
+            factorization_cache (FactorizationCache | None, optional): Cache das fatorações.
+                Defaults to factorization_cache (compartilhado entre as análises).
+            update_from (Linear | None, optional): Análise calculada de uma versão anterior da
+                estrutura com a mesma topologia (nós, barras e graus de liberdade fixos). A
+                diferença das matrizes de rigidez é aplicada como uma atualização de posto baixo
+                (Woodbury) da fatoração dela. Defaults to None.
+            max_update_rank (int, optional): Número máximo de equações alteradas para usar a
+                atualização; acima disso a matriz é fatorada de novo. Defaults to
+                MAX_UPDATE_RANK.
+            plan (AssemblyPlan | None, optional): Plano de montagem compilado por uma análise da
+                mesma topologia (self.plan), com outras propriedades. Os índices de montagem e
+                a permutação da fatoração são reutilizados. None (ou um plano de outra
+                topologia) compila um novo. Defaults to None.
+
+        Raises:
+            ValueError: Se um solver iterativo for usado sem particionar os apoios
         """
+        iterative = solver.iterative if isinstance(solver, Solver) else \
+            solver in SOLVERS and SOLVERS[solver].iterative
+        if iterative and not partitioned:
+            # The 1e25 penalty ruins the conditioning and the conjugate gradient diverges
+            raise ValueError('Iterative solvers need partitioned=True (supports eliminated)')
+
         self.nodes = nodes
         self.bars = bars
         self.loads = loads
         self.supports = supports
         self.matrix_order = 6 * len(nodes)
+        self.sparse = self.matrix_order >= SPARSE_MIN_ORDER if sparse is None else sparse
+        self.solver_type = solver
+        self.solver: Solver | None = None
+        self.partitioned = partitioned
+        self.cache = cache
+        self.renumber = renumber
+        self.structure_key = structure_key
+        self.factorization_cache = factorization_cache
+        self.update_from = update_from
+        self.max_update_rank = max_update_rank
+        self.plan = plan
         self.calculated = False
-        self.displacements: dict[Load, NDArray[float64]] = {}
-        self.reactions: dict[Load, NDArray[float64]] = {}
-        self.kg: NDArray[float64] = np.array([])
-        self.kg_solution: NDArray[float64] = np.array([])
-        self.forces_vector: dict[Load,  NDArray[float64] ] = {}
+        # Lines in the user DOF order (6 · node index + DOF), also with renumber=True
+        self.displacements: NDArray[float64] = np.array([]) # (matrix_order, len(loads))
+        self.reactions: NDArray[float64] = np.array([]) # (matrix_order, len(loads))
+        self.forces_vector: NDArray[float64] = np.array([]) # (matrix_order, len(loads))
+        # Lines and columns in the internal DOF order (renumbered with renumber=True); self.kg
+        # is the global stiffness in the user DOF order
+        self._kg_internal: NDArray[float64] | sp.csr_matrix = np.array([])
+        self._displacements_internal: NDArray[float64] = np.array([])
+        self._reactions_internal: NDArray[float64] = np.array([])
+        self._forces_internal: NDArray[float64] = np.array([])
+        self.kg_solution: NDArray[float64] | sp.csr_matrix = np.array([])
+        self.free_dofs: NDArray[np.int64] = np.array([], dtype=np.int64) # DOFs of kg_solution
+        self.fixed_dofs: NDArray[np.int64] = np.array([], dtype=np.int64)
+        # Equivalent nodal loads of the bars in global coordinates (len(loads), nbars, 12)
+        self.bars_loads: NDArray[float64] = np.array([])
+        # End forces of the bars in local coordinates (len(loads), nbars, 12)
+        self.bars_forces: NDArray[float64] = np.array([])
+        self.results: Results | None = None # Immutable results, available after the calculation
+        self.kl_nr: NDArray[float64] = np.array([]) # Local stiffness without releases (nbars,12,12)
+        self.condensation: NDArray[float64] = np.array([]) # Releases operators (nbars, 12, 12)
+        self.kl: NDArray[float64] = np.array([]) # Local stiffness with releases (nbars, 12, 12)
+        self.r3: NDArray[float64] = np.array([]) # Direction cosines of the bars (nbars, 3, 3)
+        self.klg: NDArray[float64] = np.array([]) # Global stiffness of the bars (nbars, 12, 12)
+
+        # Node -> DOF table, built once
+        self.node_index: dict[Node, int] = {}
+        self.bar_index: dict[Bar, int] = {}
+        self.connectivity: NDArray[np.int64] = np.array([], dtype=np.int64) # (nbars, 2)
+        self.node_numbering: NDArray[np.int64] = np.array([], dtype=np.int64) # Number of each node
+        self.node_dofs: NDArray[np.int64] = np.array([], dtype=np.int64) # First DOF of each node
+        self.dof_map: NDArray[np.int64] = np.array([], dtype=np.int64) # Internal DOF of user DOFs
+        self.spread_vectors: NDArray[np.int64] = np.array([], dtype=np.int64) # (nbars, 12)
+        self.bandwidth: tuple[int, int] = (0, 0) # Half-bandwidth before and after renumbering
+        self.profile: tuple[int, int] = (0, 0) # Profile before and after renumbering
+        self.calculate_dof_map()
 
         if calculate:
             self.calculate_structure()
 
+    def calculate_dof_map(self) -> None:
+        """Calcula a tabela de graus de liberdade dos nós e os vetores de espalhamento das barras
+        """
+        self.node_index = {node: index for index, node in enumerate(self.nodes)}
+        self.bar_index = {bar: index for index, bar in enumerate(self.bars)}
+
+        self.connectivity = np.array([[self.node_index[bar.start_node],
+                                       self.node_index[bar.end_node]] for bar in self.bars],
+                                     dtype=np.int64).reshape(-1, 2)
+
+        # Numeração interna dos nós; os vetores internos (kg, forças, deslocamentos) usam ela
+        nnodes = len(self.nodes)
+        original = np.arange(nnodes, dtype=np.int64)
+        if self.renumber and self.bars:
+            self.node_numbering = reverse_cuthill_mckee_numbering(nnodes, self.connectivity)
+        else:
+            self.node_numbering = original
+        self.node_dofs = 6 * self.node_numbering
+        self.dof_map = (self.node_dofs[:, np.newaxis] + np.arange(6, dtype=np.int64)).ravel()
+
+        bandwidth_before, profile_before = bandwidth_profile(original, self.connectivity)
+        bandwidth_after, profile_after = bandwidth_profile(self.node_numbering, self.connectivity)
+        self.bandwidth = (bandwidth_before, bandwidth_after)
+        self.profile = (profile_before, profile_after)
+
+        # Vetor de espalhamento de todas as barras: 6 graus de liberdade do nó inicial e do final
+        self.spread_vectors = (self.node_dofs[self.connectivity][:, :, np.newaxis] +
+                               np.arange(6, dtype=np.int64)).reshape(-1, 12)
+
+    @property
+    def kg(self) -> NDArray[float64] | sp.csr_matrix:
+        """Matriz de rigidez global (sem os apoios) na ordem dos graus de liberdade do usuário
+
+        Returns:
+            ndarray | csr_matrix: Matriz de rigidez global (matrix_order, matrix_order)
+        """
+        kg = self._kg_internal
+        if kg.shape != (self.matrix_order, self.matrix_order) or \
+            np.array_equal(self.dof_map, np.arange(self.matrix_order)):
+            return kg
+        if sp.issparse(kg):
+            return kg[self.dof_map][:, self.dof_map]
+        return kg[np.ix_(self.dof_map, self.dof_map)]
+
     def calculate_structure(self) -> None:
         """Realiza a calculo"""
-        self.displacements = {}
-        self.reactions: dict[Load, NDArray[float64]] = {}
-        self.kg_solution = self.calculate_kg_solution()
-        self.forces_vector = self.calculate_forces_vector()
+        if not self.restore_factorization():
+            self.kg_solution = self.calculate_kg_solution()
+
+            # Factorize once and solve all load cases in one back-substitution
+            solver = self.calculate_update_solver()
+            if solver is None:
+                plan = self.calculate_assembly_plan()
+                solver = select_solver(self.kg_solution, self.solver_type)
+                solver.nodes = self.free_dofs // 6 # Internal node of each equation
+                solver.permutation = plan.permutation
+                solver.factorize(self.kg_solution)
+                plan.permutation = solver.permutation
+            self.solver = solver
+            self.store_factorization()
+        if self.solver is None:
+            raise ValueError('The matrix was not factorized')
+
+        self._forces_internal = self.calculate_forces_vector()
+
+        # Fixed DOFs stay with zero displacement
+        forces_free = self._forces_internal[self.free_dofs]
+        self._displacements_internal = np.zeros_like(self._forces_internal)
+        self._displacements_internal[self.free_dofs] = \
+            np.asarray(self.solver.solve(forces_free), dtype=float64).reshape(forces_free.shape)
+
+        # Calculate reactions (K_rf · u_f - f_r in the fixed DOFs)
+        self._reactions_internal = self._kg_internal @ self._displacements_internal - \
+            self._forces_internal
+
+        # Public vectors back in the user DOF order
+        self.forces_vector = self._forces_internal[self.dof_map]
+        self.displacements = self._displacements_internal[self.dof_map]
+        self.reactions = self._reactions_internal[self.dof_map]
 
-        for load in self.loads:
-            displacements_solve = np.linalg.solve(self.kg_solution, self.forces_vector[load])
+        self.calculate_extremes_bars_forces()
+        self.results = self.calculate_results()
 
-            # Use the optimized method for final result
-            self.displacements[load] = displacements_solve.astype(float64)
+        self.calculated = True
 
-            # Calculate reactions
-            self.reactions[load] = self.kg @ self.displacements[load] - self.forces_vector[load]
+    def calculate_update_solver(self) -> Solver | None:
+        """Atualiza a fatoração de self.update_from com a diferença das matrizes de rigidez
 
-        self.calculate_extremes_bars_forces()
+        Returns:
+            Solver | None: Solver com a atualização de posto baixo (ou o próprio solver se a
+                rigidez não mudou); None se a matriz deve ser fatorada de novo (sem análise
+                anterior, topologia diferente ou mais equações alteradas que max_update_rank)
+        """
+        base = self.update_from
+        if base is None or base.solver is None or isinstance(self.solver_type, Solver):
+            return None
 
-        self.calculated = True
+        # Always update the original factorization, so the changes do not pile up
+        solver, base_matrix = base.solver, base.kg_solution
+        if isinstance(solver, LowRankUpdateSolver):
+            base_matrix = solver.base_matrix
+            solver = solver.base
+
+        if base.matrix_order != self.matrix_order or \
+            not np.array_equal(base.node_dofs, self.node_dofs) or \
+            not np.array_equal(base.free_dofs, self.free_dofs):
+            return None
+
+        equations, difference = matrix_difference(self.kg_solution, base_matrix)
+        if not equations.size:
+            return solver.copy()
+        if equations.size > self.max_update_rank:
+            return None
+
+        update = LowRankUpdateSolver(solver.copy(), base_matrix, equations, difference)
+        update.factorize(self.kg_solution)
 
-    def calculate_forces_vector(self) -> dict[Load, NDArray[float64]]:
-        """Calcula o vetor de forças para cada caso de carga e cria um dicionário
+        return update
+
+    def factorization_key(self) -> Hashable | None:
+        """Chave da fatoração no cache: rigidez da estrutura e opções da análise
+
+        Returns:
+            Hashable | None: Chave; None se a fatoração não pode ser compartilhada (sem
+                structure_key, sem cache ou com uma instância de Solver)
+        """
+        if self.structure_key is None or self.factorization_cache is None or \
+            isinstance(self.solver_type, Solver):
+            return None
+
+        return (self.structure_key, self.sparse, self.solver_type, self.partitioned,
+                self.renumber, self.matrix_order)
+
+    def restore_factorization(self) -> bool:
+        """Reutiliza a fatoração de uma análise com a mesma rigidez
+
+        Returns:
+            bool: True se a fatoração foi encontrada no cache
+        """
+        key = self.factorization_key()
+        if key is None or self.factorization_cache is None:
+            return False
+
+        factorization = self.factorization_cache.get(key)
+        if factorization is None:
+            return False
+
+        # As matrizes são só lidas; o solver é copiado para cada análise (outras threads)
+        for name in FACTORIZATION_ATTRIBUTES:
+            setattr(self, name, factorization[name])
+        self.solver = factorization['solver'].copy()
+        self.assign_bars_matrices()
+
+        return True
+
+    def store_factorization(self) -> None:
+        """Guarda a fatoração no cache"""
+        key = self.factorization_key()
+        if key is not None and self.factorization_cache is not None and \
+            self.solver is not None:
+            factorization = {name: getattr(self, name) for name in FACTORIZATION_ATTRIBUTES}
+            factorization['solver'] = self.solver.copy()
+            self.factorization_cache.put(key, factorization)
+
+    def calculate_forces_vector(self) -> NDArray[float64]:
+        """Calcula os vetores de forças de todos os casos de carga
 
         Returns:
-            dict: Vetor de forças
+            ndarray: Vetores de forças, uma coluna por caso de carga (matrix_order, len(loads))
         """
-        forces: dict[Load, NDArray[float64]] = {}
-        for load in self.loads:
-            f_load = np.zeros(self.matrix_order, dtype=float)
+        forces = np.zeros([self.matrix_order, len(self.loads)])
+        for load_index, load in enumerate(self.loads):
+            f_load = forces[:, load_index]
 
             for node in load.nodes_loads:
-                node_position = (self.nodes.index(node) + 1) * 6 - 6
+                node_position = self.node_dofs[self.node_index[node]]
 
                 for force in load.nodes_loads[node].values():
                     index = 0
@@ -77,104 +340,325 @@ class Linear:
                         f_load[node_position + index] += force[key]
                         index += 1
 
-            for bar in load.bars_loads_pt:
-                bar.calculate_forces_vector(load)
-                spread_vector = self.calculate_spread_vector(bar)
+        # Loads in bars: scatter of all bars and load cases at once
+        self.bars_loads = self.calculate_bars_loads()
+        np.add.at(forces,
+                  (self.spread_vectors[np.newaxis],
+                   np.arange(len(self.loads))[:, np.newaxis, np.newaxis]),
+                  self.bars_loads)
 
-                for i in range(12):
-                    f_load[spread_vector[i]] += bar.vector_loads[i]
+        return forces
 
-            for bar in load.bars_loads_dist:
-                bar.calculate_forces_vector(load)
-                spread_vector = self.calculate_spread_vector(bar)
+    def calculate_bars_loads(self) -> NDArray[float64]:
+        """Calcula as cargas nodais equivalentes das barras de todos os casos de carga
 
-                for i in range(12):
-                    f_load[spread_vector[i]] += bar.vector_loads[i]
+        As reações de engastamento de todas as cargas das barras são calculadas de uma vez
+        (bars_loads_vectors); a condensação das liberações e a rotação para o sistema global são
+        aplicadas em todas as barras e casos de carga de uma vez.
 
-            forces[load] = f_load.copy()
+        Returns:
+            ndarray: Cargas nodais equivalentes no sistema global (len(loads), nbars, 12)
+        """
+        loads_vectors = bars_loads_vectors(self.bars, self.loads, self.r3)
 
-        return forces
+        # Apply releases to the loads vectors before transforming to global coordinates
+        loads_vectors = (self.condensation @ loads_vectors[..., np.newaxis])[..., 0]
 
-    def calculate_kg(self) -> NDArray[float64]:
+        return rotation.to_global(loads_vectors, self.r3)
+
+    def calculate_bars_stiffness(self) -> None:
+        """Calcula as matrizes de rigidez de todas as barras
+
+        As matrizes locais sem liberações (self.kl_nr), os operadores de condensação das
+        liberações (self.condensation), as matrizes locais com liberações (self.kl), os cossenos
+        diretores (self.r3) e as matrizes globais (self.klg) são calculados de uma vez e cada
+        barra guarda vistas das suas matrizes. As matrizes locais vêm do cache (self.cache).
+        """
+        signatures = bars_signatures(self.bars)
+        if not self.bars:
+            self.kl_nr = self.condensation = self.kl = self.klg = np.zeros([0, 12, 12])
+            self.r3 = np.zeros([0, 3, 3])
+            return
+
+        if self.cache is None:
+            self.kl_nr, self.condensation, self.kl = element_matrices(signatures)
+        else:
+            self.kl_nr, self.condensation, self.kl = self.cache.get(signatures)
+        self.r3 = rotation.direction_cosines(
+            [bar.start_node.position for bar in self.bars],
+            [bar.end_node.position for bar in self.bars],
+            [bar.rotation for bar in self.bars],
+            [bar.y_up for bar in self.bars])
+
+        self.klg = rotation.to_global_matrix(self.kl, self.r3)
+        self.assign_bars_matrices()
+
+    def assign_bars_matrices(self) -> None:
+        """Atribui a cada barra as vistas das suas matrizes"""
+        for index, bar in enumerate(self.bars):
+            bar.calculate_kl(self.kl_nr[index], self.condensation[index], self.kl[index])
+            bar.calculate_r(self.r3[index])
+            bar.calculate_klg(self.klg[index])
+
+    def calculate_kg(self) -> NDArray[float64] | sp.csr_matrix:
         """ Calcula a matriz de rigidez global
 
         Returns:
-            ndarray: Matriz de rigidez global
+            ndarray | csr_matrix: Matriz de rigidez global (esparsa se self.sparse)
+        """
+        if self.sparse:
+            return self.calculate_kg_sparse()
+
+        self.calculate_bars_stiffness()
+        plan = self.calculate_assembly_plan()
+
+        return plan.to_dense(plan.assemble(self.klg))
+
+    def calculate_kg_sparse(self) -> sp.csr_matrix:
+        """Calcula a matriz de rigidez global em formato esparso
+
+        Os termos de cada barra são somados nas posições do padrão de esparsidade pelos índices
+        do plano de montagem (self.plan) e a matriz é criada direto em CSR.
+
+        Returns:
+            csr_matrix: Matriz de rigidez global
         """
-        kg = np.zeros([self.matrix_order, self.matrix_order])
+        self.calculate_bars_stiffness()
+        plan = self.calculate_assembly_plan()
+
+        return plan.to_sparse(plan.assemble(self.klg))
 
-        for bar in self.bars:
-            spread_vector = self.calculate_spread_vector(bar)
-            bar.calculate_kl()
-            bar.calculate_r()
-            bar.klg = bar.calculate_klg()
+    def calculate_assembly_plan(self) -> AssemblyPlan:
+        """Compila o plano de montagem da topologia, se o atual não for dela
 
-            line_local = -1 # Índice da linha localmente
-            for line_global in spread_vector:
-                line_local += 1
-                column_local = -1 # Índice da coluna localmente
-                for column_global in spread_vector:
-                    column_local += 1
-                    kg[line_global][column_global] += bar.klg[line_local][column_local]
+        Returns:
+            AssemblyPlan: Plano de montagem (self.plan)
+        """
+        if self.plan is None or \
+            not self.plan.matches(self.spread_vectors, self.matrix_order, self.free_dofs):
+            self.plan = AssemblyPlan(self.spread_vectors, self.matrix_order, self.free_dofs)
 
-        return kg
+        return self.plan
 
-    def calculate_kg_solution(self) -> NDArray[float64]:
+    def calculate_kg_solution(self) -> NDArray[float64] | sp.csr_matrix:
         """Aplica os apoios na matriz
 
+        No modo particionado os graus de liberdade fixos são removidos e a matriz retornada é
+        apenas o bloco livre (self.free_dofs). As molas ficam sempre somadas na diagonal.
+
         Returns:
-            ndarray: Matriz de rigidez com os apoios aplicados
+            ndarray | csr_matrix: Matriz de rigidez com os apoios aplicados
         """
-        self.kg = self.calculate_kg()
-        kg_solution = self.kg.copy()
+        diagonal = np.zeros(self.matrix_order)
+        fixed = np.zeros(self.matrix_order, dtype=bool)
 
         for node in self.supports.nodes_support:
-            # Índices globais de cada nó
-            node_index = self.nodes.index(node)
+            # Primeiro grau de liberdade (numeração interna) de cada nó
+            node_position = self.node_dofs[self.node_index[node]]
 
-            support_indices: list[int] = []
-            spring_index = {}
             index = 0
             for support in self.supports.nodes_support[node].values():
                 if support:
+                    # Se tiver mola, soma apenas a mola; senão o grau de liberdade é fixo
                     if is_number(support):
-                        spring_index[6 * (node_index + 1) - (6 - index)] = support
-                    support_indices.append(6 * (node_index + 1) - (6 - index))
+                        diagonal[node_position + index] += support
+                    else:
+                        fixed[node_position + index] = True
 
                 index += 1
 
-
+        self.fixed_dofs = np.flatnonzero(fixed)
+        if self.partitioned:
+            self.free_dofs = np.flatnonzero(~fixed)
+        else:
             # Colocar número grande na diagonal
-            for i in support_indices:
-                for j in support_indices:
-                    if i == j:
-                        # Se tiver mola, soma apenas a mola
-                        if i in spring_index:
-                            kg_solution[i][j] += spring_index[i]
-                        else:
-                            kg_solution[i][j] += 1e25
-
-        return kg_solution
-
-    def calculate_spread_vector(self, bar: Bar) -> list[int]:
+            self.free_dofs = np.arange(self.matrix_order)
+            diagonal[fixed] += 1e25
+
+        kg = self._kg_internal = self.calculate_kg()
+        if not isinstance(kg, np.ndarray): # Sparse (self.sparse)
+            return self.calculate_assembly_plan().free_block(kg.data, diagonal)
+
+        kg_solution = kg.copy()
+        kg_solution[np.diag_indices(self.matrix_order)] += diagonal
+
+        return kg_solution[np.ix_(self.free_dofs, self.free_dofs)]
+
+    def calculate_spread_vector(self, bar: Bar) -> NDArray[np.int64]:
         """Calcula o vetor de espalhamento
 
         Args:
             bar (Bar): Barra
 
         Returns:
-            list[int]: Vetor de espalhamento
+            ndarray: Vetor de espalhamento
         """
-        # Vetor de espalhamento *******************************************************************
-        ni = self.nodes.index(bar.start_node) # Índice do nó inicial
-        nf = self.nodes.index(bar.end_node) # Índice do nó final
+        return self.spread_vectors[self.bar_index[bar]]
 
-        spread_vector = [6 * (ni + 1) - 6, 6 * (ni + 1) - 5, 6 * (ni + 1) - 4,
-                         6 * (ni + 1) - 3, 6 * (ni + 1) - 2, 6 * (ni + 1) - 1,
-                         6 * (nf + 1) - 6, 6 * (nf + 1) - 5, 6 * (nf + 1) - 4,
-                         6 * (nf + 1) - 3, 6 * (nf + 1) - 2, 6 * (nf + 1) - 1]
-        return spread_vector
 
+    def calculate_results(self) -> Results:
+        """Cria os resultados imutáveis da análise
+
+        As reações são zeradas nos graus de liberdade sem apoio (e nos nós sem apoios); os
+        resultados calculados (self.reactions) não são alterados.
+
+        Returns:
+            Results: Deslocamentos, reações e esforços nas barras por caso de carga
+        """
+        nloads = len(self.loads)
+        nnodes = len(self.nodes)
+
+        supports_nodes = np.array([self.node_index[node] for node in self.supports.nodes_support],
+                                  dtype=np.int64)
+        supported = np.zeros([nnodes, 6], dtype=bool)
+        for node_index, support in zip(supports_nodes, self.supports.nodes_support.values()):
+            supported[node_index] = [bool(value) for value in support.values()]
+
+        reactions = self.reactions.T.reshape(nloads, nnodes, 6)
+
+        return Results([node.name for node in self.nodes],
+                       [load.name for load in self.loads],
+                       [bar.name for bar in self.bars],
+                       self.displacements.T.reshape(nloads, nnodes, 6),
+                       np.where(supported, reactions, 0.0),
+                       self.bars_forces,
+                       supports_nodes)
+
+    def get_results(self) -> Results:
+        """Pega os resultados imutáveis, calculando a estrutura se ainda não foi calculada
+
+        Returns:
+            Results: Deslocamentos, reações e esforços nas barras por caso de carga
+        """
+        if self.results is None:
+            self.calculate_structure()
+
+        return self.results # type: ignore[return-value]
+
+    def combine(self, combinations: list[Combination]) -> Results:
+        """Combina os resultados dos casos de carga (sem resolver a estrutura de novo)
+
+        Args:
+            combinations (list[Combination]): Combinações dos casos de carga
+
+        Returns:
+            Results: Deslocamentos, reações e esforços nas barras por combinação
+        """
+        return self.get_results().combine(combinations)
+
+    def envelope(self, combinations: list[Combination] | None = None,
+                 chunk_size: int | None = None) -> Envelope:
+        """Calcula a envoltória (máximos e mínimos) dos casos de carga ou das combinações
+
+        Args:
+            combinations (list[Combination] | None, optional): Combinações da envoltória. None
+                usa os casos de carga. Defaults to None.
+            chunk_size (int | None, optional): Combinações calculadas de cada vez. None limita
+                pela memória (CHUNK_VALUES). Defaults to None.
+
+        Returns:
+            Envelope: Máximos e mínimos com os casos que governam cada valor
+        """
+        return Envelope(self.get_results(), combinations, chunk_size)
+
+    def calculate_diagrams(self, number: int = 11, positions: NDArray[float64] | None = None,
+                           side: Literal['left', 'right'] = 'right'
+                           ) -> tuple[NDArray[float64], NDArray[float64]]:
+        """Calcula os diagramas de esforços de todas as barras e casos de carga de uma vez
+
+        Args:
+            number (int, optional): Número de estações igualmente espaçadas por barra
+                (extremidades incluídas). Defaults to 11.
+            positions (NDArray[float64] | None, optional): Estações de cada barra em ordem
+                crescente (nbars, nstations). None usa as estações igualmente espaçadas.
+                Defaults to None.
+            side (Literal['left', 'right'], optional): Valor antes ('left') ou depois ('right')
+                de uma carga concentrada na estação. Defaults to 'right'.
+
+        Returns:
+            tuple[NDArray[float64], NDArray[float64]]: Estações (nbars, nstations) e N, Vy, Vz,
+                T, My, Mz nas estações com os sinais de bar.extreme_forces
+                (len(loads), nbars, nstations, 6)
+        """
+        lengths = np.array([bar.length for bar in self.bars], dtype=float64)
+        if positions is None:
+            positions = efforts_diagrams.stations(lengths, number)
+
+        point_loads, distributed_loads = bars_loads_columns(self.bars, self.loads, self.r3)
+
+        return positions, efforts_diagrams.diagrams(lengths, positions, self.bars_forces,
+                                                    point_loads, distributed_loads, side)
+
+    def calculate_member_response(self) -> MemberResponse:
+        """Calcula os esforços e as deformadas das barras como polinômios por trechos
+
+        Os trechos são separados pelas cargas concentradas e pelas extremidades das cargas
+        distribuídas, para todas as barras e casos de carga de uma vez.
+
+        Returns:
+            MemberResponse: Polinômios dos esforços (sinais de bar.extreme_forces) e dos
+                deslocamentos nos eixos locais
+        """
+        lengths = np.array([bar.length for bar in self.bars], dtype=float64)
+        rigidities = np.array([[bar.material.properties['E'] * bar.section.properties[name]
+                                for name in ('area', 'Iy', 'Iz')] for bar in self.bars],
+                              dtype=float64).reshape(-1, 3)
+
+        # Deslocamentos das extremidades das barras nos eixos locais (len(loads), nbars, 12)
+        end_displacements = rotation.to_local(
+            np.moveaxis(self._displacements_internal[self.spread_vectors], -1, 0), self.r3)
+
+        return MemberResponse([load.name for load in self.loads],
+                              [bar.name for bar in self.bars],
+                              lengths, self.bars_forces, end_displacements, rigidities,
+                              *bars_loads_columns(self.bars, self.loads, self.r3))
+
+    def calculate_deflected_shape(self, number: int = 11,
+                                  positions: NDArray[float64] | None = None
+                                  ) -> tuple[NDArray[float64], NDArray[np.float32]]:
+        """Calcula os deslocamentos ao longo de todas as barras e casos de carga de uma vez
+
+        Os deslocamentos são a interpolação de Hermite das extremidades das barras nos eixos
+        locais (com as liberações recuperadas) mais a deformada da barra biengastada com as
+        cargas no vão, transformados para o sistema global com self.r3.
+
+        Args:
+            number (int, optional): Número de estações igualmente espaçadas por barra
+                (extremidades incluídas). Defaults to 11.
+            positions (NDArray[float64] | None, optional): Estações de cada barra
+                (nbars, nstations). None usa as estações igualmente espaçadas. Defaults to None.
+
+        Returns:
+            tuple[NDArray[float64], NDArray[np.float32]]: Estações (nbars, nstations) e
+                deslocamentos no sistema global nas estações, contíguos em float32
+                (len(loads), nbars, nstations, 3)
+        """
+        lengths = np.array([bar.length for bar in self.bars], dtype=float64)
+        if positions is None:
+            positions = efforts_diagrams.stations(lengths, number)
+        rigidities = np.array([[bar.material.properties['E'] * bar.section.properties[name]
+                                for name in ('area', 'Iy', 'Iz')] for bar in self.bars],
+                              dtype=float64).reshape(-1, 3)
+
+        # Deslocamentos das extremidades das barras nos eixos locais, com os graus de liberdade
+        # liberados recuperados das cargas sem condensação (len(loads), nbars, 12)
+        loads_vectors = bars_loads_vectors(self.bars, self.loads, self.r3)
+        releases = np.array([bar.release_mask for bar in self.bars], dtype=bool).reshape(-1, 12)
+        end_displacements = stiffness.released_displacements(
+            self.kl_nr, releases,
+            rotation.to_local(np.moveaxis(self._displacements_internal[self.spread_vectors], -1, 0),
+                              self.r3),
+            loads_vectors)
+
+        displacements = efforts_deflections.deflected_shape(
+            lengths, positions, end_displacements, loads_vectors, rigidities,
+            *bars_loads_columns(self.bars, self.loads, self.r3))
+
+        # Vetores (u, v, w) de cada estação para o sistema global
+        shape = displacements.shape
+        displacements = rotation.to_global(displacements.reshape(*shape[:2], -1), self.r3)
+
+        return positions, np.ascontiguousarray(displacements.reshape(shape), dtype=np.float32)
 
     def get_displacements(self, node_name: str, load_name: str) -> NDArray[float64]:
         """Pega os deslocamentos
@@ -184,22 +668,12 @@ class Linear:
             load_name (str): Nome do caso de carga
 
         Returns:
-            ndarray: Deslocamentos
+            ndarray: Deslocamentos (vista somente leitura de self.results)
         """
-        node_displacements: NDArray[float64] = np.array([])
-        for load in self.loads:
-            if load.name == load_name:
-                for node in self.nodes:
-                    if node.name == node_name:
-                        node_index = self.nodes.index(node) # Node index
-                        initial_index = 6 * (node_index + 1) - 6
-                        end_index = 6 * (node_index + 1)
-
-                        node_displacements = self.displacements[load][initial_index : end_index]
-                        break
-                break
+        if self.results is None:
+            return np.array([])
 
-        return node_displacements
+        return self.results.get_displacements(node_name, load_name)
 
     def get_reactions(self, node_name: str, load_name: str) -> NDArray[float64]:
         """Pega as reações
@@ -209,45 +683,34 @@ class Linear:
             load_name (str): Nome do caso de carga
 
         Returns:
-            ndarray: Reações
+            ndarray: Reações, zero nas direções sem apoio (vista somente leitura de self.results)
         """
-        node_reactions: NDArray[float64] = np.array([])
-        for load in self.loads:
-            if load.name == load_name:
-                for node in self.nodes:
-                    if node.name == node_name:
-                        node_index = self.nodes.index(node) # Node index
-                        initial_index = 6 * (node_index + 1) - 6
-                        end_index = 6 * (node_index + 1)
-
-                        node_reactions = self.reactions[load][initial_index : end_index]
+        if self.results is None:
+            return np.array([])
 
-                        for reaction_index, support in \
-                            enumerate(self.supports.nodes_support[node].values()):
-                            if not support:
-                                node_reactions[reaction_index] = 0.0
-                        break
-                break
-
-        return node_reactions
+        return self.results.get_reactions(node_name, load_name)
 
     def calculate_extremes_bars_forces(self):
         """Calculate extreme forces in bars
+
+        The end forces of all bars and load cases are calculated at once (self.bars_forces) and
+        each bar keeps views of its forces by load case name (bar.extreme_forces).
         """
-        for bar in self.bars:
-            for load in self.loads:
-                # Get nodal displacements for this bar
-                start_displacements = self.get_displacements(bar.start_node.name, load.name)
-                end_displacements = self.get_displacements(bar.end_node.name, load.name)
-                displacements = np.concatenate((start_displacements, end_displacements))
-
-                # Calculate bar forces: displacement forces - equivalent nodal forces
-                # The negative sign accounts for the fact that vector_loads are forces
-                # applied TO the bar, while we want forces IN the bar
-                displacement_forces = bar.klg @ displacements
-                bar_forces = displacement_forces - bar.vector_loads
-
-                # Transform to local coordinates and apply sign convention
-                bar.extreme_forces[load.name] = (bar.r @ bar_forces) * \
-                    np.array([-1,  1,  1,  1,  1, -1,
-                               1, -1, -1, -1, -1,  1])
+        signs = np.array([-1,  1,  1,  1,  1, -1,
+                           1, -1, -1, -1, -1,  1])
+
+        # Nodal displacements of all bars (len(loads), nbars, 12)
+        displacements = np.moveaxis(self._displacements_internal[self.spread_vectors], -1, 0)
+
+        # Calculate bar forces: displacement forces - equivalent nodal forces
+        # The negative sign accounts for the fact that bars_loads are forces
+        # applied TO the bar, while we want forces IN the bar
+        displacement_forces = (self.klg @ displacements[..., np.newaxis])[..., 0]
+        bars_forces = displacement_forces - self.bars_loads
+
+        # Transform to local coordinates and apply sign convention
+        self.bars_forces = rotation.to_local(bars_forces, self.r3) * signs
+
+        loads_names = [load.name for load in self.loads]
+        for index, bar in enumerate(self.bars):
+            bar.extreme_forces = dict(zip(loads_names, self.bars_forces[:, index]))
@@ -0,0 +1,151 @@
+"""Internal forces and deflections along the bars as piecewise polynomials"""
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import Literal
+
+import numpy as np
+from numpy.typing import NDArray
+from numpy import float64
+
+from ..functions.engineering.efforts import piecewise
+from ..types import BarsDistLoads, BarsPtLoads
+from ._arrays import first_index, read_only
+
+
+class MemberResponse:
+    """Immutable piecewise polynomials of the internal forces and deflections of the bars
+
+    Each bar of each load case (group: load_index · nbars + bar_index) is split in segments at
+    the point loads and at the ends of the distributed loads. The segments of all groups are
+    stored in compact arrays (indptr, starts, ends) and the coefficients are in powers of
+    t = x - start, so any position is evaluated after a binary search in the segments of its
+    group. The forces have the signs of bar.extreme_forces.
+    """
+    loads_names: tuple[str, ...] # Names of the load cases in the order of the groups
+    bars_names: tuple[str, ...] # Names of the bars in the order of the groups
+    lengths: NDArray[float64] # Length of the bars (len(bars),)
+    indptr: NDArray[np.int64] # First segment of each group (len(loads) · len(bars) + 1,)
+    starts: NDArray[float64] # Start of each segment (nsegments,)
+    ends: NDArray[float64] # End of each segment (nsegments,)
+    forces: NDArray[float64] # N, Vy, Vz, T, My, Mz of each segment (nsegments, 6, 4)
+    deflections: NDArray[float64] # u, v, w in local axes of each segment (nsegments, 3, 6)
+    load_index: MappingProxyType[str, int] # Name of the load case -> index
+    bar_index: MappingProxyType[str, int] # Name of the bar -> index
+
+    def __init__(self,
+                 loads_names: list[str],
+                 bars_names: list[str],
+                 lengths: NDArray[float64],
+                 end_forces: NDArray[float64],
+                 end_displacements: NDArray[float64],
+                 rigidities: NDArray[float64],
+                 point_loads: BarsPtLoads,
+                 distributed_loads: BarsDistLoads):
+        """Immutable piecewise polynomials of the internal forces and deflections of the bars
+
+        Args:
+            loads_names (list[str]): Names of the load cases
+            bars_names (list[str]): Names of the bars
+            lengths (NDArray[float64]): Length of the bars (len(bars),)
+            end_forces (NDArray[float64]): End forces in local coordinates with the signs of
+                bar.extreme_forces (len(loads), len(bars), 12)
+            end_displacements (NDArray[float64]): Displacements of the ends of the bars in local
+                coordinates (len(loads), len(bars), 12)
+            rigidities (NDArray[float64]): EA, EIy and EIz of the bars (len(bars), 3)
+            point_loads (BarsPtLoads): Point loads in local coordinates
+            distributed_loads (BarsDistLoads): Distributed loads in local coordinates
+        """
+        self.loads_names = tuple(loads_names)
+        self.bars_names = tuple(bars_names)
+        self.lengths = read_only(lengths)
+
+        indptr, starts, ends, forces, deflections = piecewise.member_response(
+            self.lengths, end_forces, end_displacements, rigidities, point_loads,
+            distributed_loads)
+        self.indptr = read_only(indptr, np.int64)
+        self.starts = read_only(starts)
+        self.ends = read_only(ends)
+        self.forces = read_only(forces)
+        self.deflections = read_only(deflections)
+        self.load_index = first_index(loads_names)
+        self.bar_index = first_index(bars_names)
+
+    def get_forces(self, positions: NDArray[float64],
+                   side: Literal['left', 'right'] = 'right') -> NDArray[float64]:
+        """Internal forces at the stations of all bars and load cases
+
+        Args:
+            positions (NDArray[float64]): Stations of each bar (len(bars), nstations)
+            side (Literal['left', 'right'], optional): Value at a point load or at the end of a
+                distributed load: 'left' before the load and 'right' after the load. Defaults
+                to 'right'.
+
+        Returns:
+            NDArray[float64]: N, Vy, Vz, T, My, Mz (len(loads), len(bars), nstations, 6)
+        """
+        return self._evaluate(self.forces, positions, side)
+
+    def get_deflections(self, positions: NDArray[float64]) -> NDArray[float64]:
+        """Deflections in local axes at the stations of all bars and load cases
+
+        Args:
+            positions (NDArray[float64]): Stations of each bar (len(bars), nstations)
+
+        Returns:
+            NDArray[float64]: u, v, w (len(loads), len(bars), nstations, 3)
+        """
+        return self._evaluate(self.deflections, positions, 'right')
+
+    def get_extremes(self) -> tuple[NDArray[float64], NDArray[float64], NDArray[float64],
+                                    NDArray[float64]]:
+        """Maximum and minimum internal forces along the bars and their positions
+
+        The candidates are the ends of the segments (both sides of the loads) and the roots of
+        the derivatives inside the segments (the points of null shear for the moments), so the
+        extremes are exact and do not depend on stations.
+
+        Returns:
+            tuple[NDArray[float64], NDArray[float64], NDArray[float64], NDArray[float64]]:
+                Maximum, its position, minimum and its position of N, Vy, Vz, T, My, Mz
+                (len(loads), len(bars), 6)
+        """
+        shape = (len(self.loads_names), len(self.bars_names), self.forces.shape[1])
+        return tuple(values.reshape(shape) # type: ignore[return-value]
+                     for values in piecewise.extremes(self.indptr, self.starts, self.ends,
+                                                      self.forces))
+
+    def get_segments(self, bar_name: str, load_name: str) -> tuple[NDArray[float64],
+                                                                   NDArray[float64],
+                                                                   NDArray[float64],
+                                                                   NDArray[float64]]:
+        """Segments of the bar in the load case
+
+        Args:
+            bar_name (str): Name of the bar
+            load_name (str): Name of the load case
+
+        Returns:
+            tuple[NDArray[float64], NDArray[float64], NDArray[float64], NDArray[float64]]:
+                Starts and ends of the segments, coefficients of the forces (nsegments, 6, 4)
+                and of the deflections (nsegments, 3, 6) in powers of x - start (read-only
+                views)
+        """
+        group = self.load_index[load_name] * len(self.bars_names) + self.bar_index[bar_name]
+        segments = slice(self.indptr[group], self.indptr[group + 1])
+        return (self.starts[segments], self.ends[segments], self.forces[segments],
+                self.deflections[segments])
+
+    def _evaluate(self, coefficients: NDArray[float64], positions: NDArray[float64],
+                  side: Literal['left', 'right']) -> NDArray[float64]:
+        positions = np.asarray(positions, dtype=float64)
+        if np.any(positions < 0) or np.any(positions > self.lengths[:, np.newaxis]):
+            raise ValueError('Position x is out of bounds')
+
+        nloads, nbars = len(self.loads_names), len(self.bars_names)
+        x = np.broadcast_to(positions, (nloads, *positions.shape)).ravel()
+        groups = np.repeat(np.arange(nloads * nbars), positions.shape[1])
+        segments = piecewise.segment_search(self.indptr, self.starts, groups, x, side)
+        values = piecewise.evaluate(coefficients[segments], x - self.starts[segments])
+
+        return values.reshape(nloads, *positions.shape, coefficients.shape[1])
@@ -0,0 +1,69 @@
+"""Renumbering of the nodes to reduce the bandwidth and the profile of the stiffness matrix"""
+import numpy as np
+from numpy.typing import NDArray
+from scipy import sparse as sp # type: ignore
+from scipy.sparse.csgraph import reverse_cuthill_mckee # type: ignore
+
+
+def nodes_graph(nnodes: int, connectivity: NDArray[np.int64]) -> sp.csr_matrix:
+    """Graph of the nodes connected by bars (pattern of the stiffness matrix by node)
+
+    Args:
+        nnodes (int): Number of nodes
+        connectivity (NDArray[np.int64]): Start and end node of each bar (nbars, 2)
+
+    Returns:
+        sp.csr_matrix: Symmetric adjacency matrix of the nodes (nnodes, nnodes)
+    """
+    rows = np.concatenate([connectivity[:, 0], connectivity[:, 1], np.arange(nnodes)])
+    columns = np.concatenate([connectivity[:, 1], connectivity[:, 0], np.arange(nnodes)])
+
+    return sp.csr_matrix((np.ones(rows.size), (rows, columns)), shape=(nnodes, nnodes))
+
+
+def reverse_cuthill_mckee_numbering(nnodes: int,
+                                    connectivity: NDArray[np.int64]) -> NDArray[np.int64]:
+    """New numbers of the nodes by the reverse Cuthill-McKee ordering
+
+    Args:
+        nnodes (int): Number of nodes
+        connectivity (NDArray[np.int64]): Start and end node of each bar (nbars, 2)
+
+    Returns:
+        NDArray[np.int64]: New number of each node (nnodes,)
+    """
+    order = reverse_cuthill_mckee(nodes_graph(nnodes, connectivity), symmetric_mode=True)
+
+    numbering = np.empty(nnodes, dtype=np.int64)
+    numbering[order] = np.arange(nnodes, dtype=np.int64)
+
+    return numbering
+
+
+def bandwidth_profile(numbering: NDArray[np.int64],
+                      connectivity: NDArray[np.int64]) -> tuple[int, int]:
+    """Bandwidth and profile of the stiffness matrix (6 DOFs per node) for a numbering
+
+    Args:
+        numbering (NDArray[np.int64]): Number of each node (nnodes,)
+        connectivity (NDArray[np.int64]): Start and end node of each bar (nbars, 2)
+
+    Returns:
+        tuple[int, int]: Bandwidth (largest distance of a term to the diagonal) and profile
+            (sum of the distances from the first term of each line to the diagonal)
+    """
+    start = numbering[connectivity[:, 0]]
+    end = numbering[connectivity[:, 1]]
+
+    # First node (column) of each node line, lines in the order of the numbering
+    lines = np.arange(numbering.size, dtype=np.int64)
+    first = lines.copy()
+    np.minimum.at(first, start, end)
+    np.minimum.at(first, end, start)
+
+    # 6 DOFs per node: a node distance d is 6·d + 5 in DOFs for the bandwidth, and the 6 lines of
+    # a node add 36·d + (0 + 1 + ... + 5) to the profile
+    bandwidth = 6 * int(np.max(np.abs(start - end), initial=0)) + 5 if numbering.size else 0
+    profile = 36 * int(np.sum(lines - first)) + 15 * numbering.size
+
+    return bandwidth, profile
@@ -0,0 +1,194 @@
+"""Results of the analysis stored by columns (arrays indexed by load case, node and bar)"""
+from __future__ import annotations
+
+from types import MappingProxyType
+
+import numpy as np
+from numpy.typing import NDArray
+from numpy import float64
+
+from ..objects import Combination
+from ._arrays import first_index, read_only
+
+DISPLACEMENTS_KEYS = ('Dx', 'Dy', 'Dz', 'Rx', 'Ry', 'Rz')
+REACTIONS_KEYS = ('Fx', 'Fy', 'Fz', 'Mx', 'My', 'Mz')
+BARS_FORCES_KEYS = ('Fxi', 'Fyi', 'Fzi', 'Mxi', 'Myi', 'Mzi',
+                    'Fxj', 'Fyj', 'Fzj', 'Mxj', 'Myj', 'Mzj')
+
+ResultsList = list[dict[str, str | list[dict[str, str | float]]]]
+
+
+def combination_factors(combinations: list[Combination],
+                        loads_names: tuple[str, ...] | list[str]) -> NDArray[float64]:
+    """Matrix of the factors of the combinations
+
+    Args:
+        combinations (list[Combination]): Combinations
+        loads_names (tuple[str, ...] | list[str]): Names of the load cases in the order of the
+            results
+
+    Raises:
+        ValueError: If a combination uses a load case that is not in the results
+
+    Returns:
+        NDArray[float64]: Factors (len(combinations), len(loads_names))
+    """
+    load_index = first_index(list(loads_names))
+    factors = np.zeros([len(combinations), len(loads_names)])
+    for combination_index, combination in enumerate(combinations):
+        for load_name, factor in combination.factors.items():
+            if load_name not in load_index:
+                raise ValueError(f"The combination '{combination.name}' uses the load case "
+                                 f"'{load_name}', which is not in the results")
+            factors[combination_index, load_index[load_name]] += factor
+
+    return factors
+
+
+class Results:
+    """Immutable results of the analysis
+
+    The arrays are read-only and the searches by name are dictionaries, so the getters and the
+    selections by load case return views without copies.
+    """
+    nodes_names: tuple[str, ...] # Names of the nodes in the order of the arrays
+    loads_names: tuple[str, ...] # Names of the load cases in the order of the arrays
+    bars_names: tuple[str, ...] # Names of the bars in the order of the arrays
+    displacements: NDArray[float64] # Displacements (len(loads), len(nodes), 6)
+    reactions: NDArray[float64] # Reactions, zero without support (len(loads), len(nodes), 6)
+    bars_forces: NDArray[float64] # End forces in local coordinates (len(loads), len(bars), 12)
+    supports_nodes: NDArray[np.int64] # Index of the nodes with supports
+    node_index: MappingProxyType[str, int] # Name of the node -> index
+    load_index: MappingProxyType[str, int] # Name of the load case -> index
+    bar_index: MappingProxyType[str, int] # Name of the bar -> index
+
+    def __init__(self,
+                 nodes_names: list[str],
+                 loads_names: list[str],
+                 bars_names: list[str],
+                 displacements: NDArray[float64],
+                 reactions: NDArray[float64],
+                 bars_forces: NDArray[float64],
+                 supports_nodes: NDArray[np.int64]):
+        """Immutable results of the analysis
+
+        Args:
+            nodes_names (list[str]): Names of the nodes
+            loads_names (list[str]): Names of the load cases
+            bars_names (list[str]): Names of the bars
+            displacements (NDArray[float64]): Displacements (len(loads), len(nodes), 6)
+            reactions (NDArray[float64]): Reactions (len(loads), len(nodes), 6)
+            bars_forces (NDArray[float64]): End forces of the bars (len(loads), len(bars), 12)
+            supports_nodes (NDArray[np.int64]): Index of the nodes with supports
+        """
+        self.nodes_names = tuple(nodes_names)
+        self.loads_names = tuple(loads_names)
+        self.bars_names = tuple(bars_names)
+        self.displacements = read_only(displacements)
+        self.reactions = read_only(reactions)
+        self.bars_forces = read_only(bars_forces)
+        self.supports_nodes = np.array(supports_nodes, dtype=np.int64)
+        self.supports_nodes.flags.writeable = False
+        self.node_index = first_index(nodes_names)
+        self.load_index = first_index(loads_names)
+        self.bar_index = first_index(bars_names)
+
+    def get_displacements(self, node_name: str, load_name: str) -> NDArray[float64]:
+        """Displacements of the node in the load case
+
+        Args:
+            node_name (str): Name of the node
+            load_name (str): Name of the load case
+
+        Returns:
+            NDArray[float64]: Displacements (6,); empty if the node or the load case do not exist
+        """
+        if node_name not in self.node_index or load_name not in self.load_index:
+            return np.array([])
+
+        return self.displacements[self.load_index[load_name], self.node_index[node_name]]
+
+    def get_reactions(self, node_name: str, load_name: str) -> NDArray[float64]:
+        """Reactions of the node in the load case
+
+        Args:
+            node_name (str): Name of the node
+            load_name (str): Name of the load case
+
+        Returns:
+            NDArray[float64]: Reactions (6,); empty if the node or the load case do not exist
+        """
+        if node_name not in self.node_index or load_name not in self.load_index:
+            return np.array([])
+
+        return self.reactions[self.load_index[load_name], self.node_index[node_name]]
+
+    def get_bar_forces(self, bar_name: str, load_name: str) -> NDArray[float64]:
+        """End forces of the bar in the load case
+
+        Args:
+            bar_name (str): Name of the bar
+            load_name (str): Name of the load case
+
+        Returns:
+            NDArray[float64]: End forces in local coordinates (12,); empty if the bar or the load
+                case do not exist
+        """
+        if bar_name not in self.bar_index or load_name not in self.load_index:
+            return np.array([])
+
+        return self.bars_forces[self.load_index[load_name], self.bar_index[bar_name]]
+
+    def combine(self, combinations: list[Combination]) -> Results:
+        """Results of the combinations of the load cases
+
+        The analysis is linear, so every array of the combinations is the matrix of factors
+        times the array of the load cases (one product, no new solution of the structure).
+
+        Args:
+            combinations (list[Combination]): Combinations of the load cases
+
+        Returns:
+            Results: Results with one "load case" per combination (in the given order)
+        """
+        factors = combination_factors(combinations, self.loads_names)
+
+        def combine(array: NDArray[float64]) -> NDArray[float64]:
+            combined = factors @ array.reshape(len(self.loads_names), -1)
+            return combined.reshape(len(combinations), *array.shape[1:])
+
+        return Results(list(self.nodes_names),
+                       [combination.name for combination in combinations],
+                       list(self.bars_names),
+                       combine(self.displacements),
+                       combine(self.reactions),
+                       combine(self.bars_forces),
+                       self.supports_nodes)
+
+    def to_list(self) -> ResultsList:
+        """Results by load case in the format of the JSON files
+
+        Returns:
+            ResultsList: Displacements of the nodes, reactions of the supports and extreme forces
+                of the bars for each load case
+        """
+        displacements = self.displacements.tolist()
+        reactions = self.reactions[:, self.supports_nodes].tolist()
+        bars_forces = self.bars_forces.tolist()
+        supports_names = [self.nodes_names[index] for index in self.supports_nodes]
+
+        results: ResultsList = []
+        for load_index, load_name in enumerate(self.loads_names):
+            results.append({
+                'load_case': load_name,
+                'displacements': [{'node': name, **dict(zip(DISPLACEMENTS_KEYS, values))}
+                                  for name, values in zip(self.nodes_names,
+                                                          displacements[load_index])],
+                'reactions': [{'node': name, **dict(zip(REACTIONS_KEYS, values))}
+                              for name, values in zip(supports_names, reactions[load_index])],
+                'extreme_forces': [{'bar': name, **dict(zip(BARS_FORCES_KEYS, values))}
+                                   for name, values in zip(self.bars_names,
+                                                           bars_forces[load_index])],
+            })
+
+        return results
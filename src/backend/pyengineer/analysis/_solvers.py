@@ -0,0 +1,559 @@
+"""Solvers for the linear system of the structure"""
+from __future__ import annotations
+
+import copy
+import sys
+import warnings
+from typing import Any, Callable, Literal
+
+import numpy as np
+from numpy.typing import NDArray
+from numpy import float64
+from scipy import sparse as sp # type: ignore
+from scipy import linalg as sla # type: ignore
+from scipy.sparse.linalg import splu, spilu, spsolve_triangular # type: ignore
+
+SolverType = Literal['auto', 'dense', 'banded', 'sparse_lu', 'sparse_cholesky', 'pcg']
+PreconditionerType = Literal['jacobi', 'block_jacobi', 'incomplete_cholesky']
+Preconditioner = Callable[[NDArray[float64]], NDArray[float64]] # Residuals -> preconditioned
+
+# Order up to which the automatic choice always uses the dense solver
+DENSE_MAX_ORDER = 600
+# Density (nnz / n²) from which the automatic choice uses the dense solver
+DENSE_MIN_DENSITY = 0.1
+# Condition number from which the update of a factorization is taken as singular (mechanism)
+CAPACITANCE_MAX_CONDITION = 1e12
+
+
+class Solver:
+    """Base interface of the solvers: factorize once, solve many times"""
+    name: str = 'solver' # Name reported after the analysis
+    iterative: bool = False # Iterative solvers need the supports eliminated (no penalty)
+    order: int # Order of the factorized matrix
+    nodes: NDArray[np.int64] | None # Node of each equation (for the nodal blocks)
+    # Fill reducing permutation of the equations, reused by the solvers that support it
+    permutation: NDArray[np.int64] | None
+
+    def __init__(self) -> None:
+        self.order = 0
+        self.nodes = None
+        self.permutation = None
+
+    def factorize(self, matrix: NDArray[float64] | sp.spmatrix) -> None:
+        """Factorize the matrix of the system
+
+        Args:
+            matrix (NDArray[float64] | sp.spmatrix): Matrix of the system
+
+        Raises:
+            np.linalg.LinAlgError: If the matrix is singular
+        """
+        raise NotImplementedError
+
+    def solve(self, rhs: NDArray[float64]) -> NDArray[float64]:
+        """Solve the system for the right hand side using the factorization
+
+        Args:
+            rhs (NDArray[float64]): Right hand side
+
+        Returns:
+            NDArray[float64]: Solution of the system
+        """
+        raise NotImplementedError
+
+    def copy(self) -> Solver:
+        """Solver that shares the factorization, with its own state of the solutions
+
+        The factorization is only read by solve, so each copy can solve in another thread
+        (the conjugate gradient keeps the residuals of the last solution in the solver).
+
+        Returns:
+            Solver: Shallow copy of the solver
+        """
+        return copy.copy(self)
+
+
+class DenseSolver(Solver):
+    """Dense LU factorization (LAPACK getrf/getrs) of the equilibrated matrix
+
+    The matrix is scaled by the inverse square roots of its diagonal (D·K·D with unit diagonal),
+    so the 1e25 penalty of the fixed DOFs and the units of translations and rotations do not
+    hide a mechanism. A mechanism rarely gives an exact zero pivot because of the rounding, so
+    the matrix is taken as singular when the estimate of the reciprocal condition number of the
+    scaled matrix (LAPACK gecon) is below the machine epsilon.
+    """
+    name = 'dense'
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.lu_piv: tuple[NDArray[float64], NDArray[np.int32]] | None = None
+        self.scale: NDArray[float64] = np.array([]) # D: 1 / sqrt(|diagonal|), 1 if zero
+
+    def factorize(self, matrix: NDArray[float64] | sp.spmatrix) -> None:
+        if not isinstance(matrix, np.ndarray):
+            matrix = matrix.toarray()
+
+        self.order = matrix.shape[0]
+        diagonal = np.abs(np.diag(matrix))
+        self.scale = np.ones(self.order)
+        positive = diagonal > 0
+        self.scale[positive] = 1 / np.sqrt(diagonal[positive])
+        scaled = matrix * self.scale[:, np.newaxis] * self.scale
+        norm = np.max(np.sum(np.abs(scaled), axis=0), initial=0.0)
+
+        with warnings.catch_warnings(): # Singular matrices are reported below
+            warnings.simplefilter('ignore', sla.LinAlgWarning)
+            lu, piv = sla.lu_factor(scaled, overwrite_a=True, check_finite=False)
+        gecon = sla.get_lapack_funcs('gecon', (lu,))
+        rcond, _ = gecon(lu, norm, norm='1')
+        if self.order and not rcond >= sys.float_info.epsilon: # nan is singular
+            raise np.linalg.LinAlgError('Singular matrix')
+
+        self.lu_piv = (lu, piv)
+
+    def solve(self, rhs: NDArray[float64]) -> NDArray[float64]:
+        if self.lu_piv is None:
+            raise ValueError('The matrix was not factorized')
+
+        # K⁻¹·f = D·(D·K·D)⁻¹·D·f
+        scale = self.scale.reshape(-1, *(1,) * (np.ndim(rhs) - 1))
+        return scale * sla.lu_solve(self.lu_piv, scale * rhs, check_finite=False)
+
+
+class BandedCholeskySolver(Solver):
+    """Banded Cholesky factorization (LAPACK pbtrf/pbtrs)
+
+    Only the band of the matrix is stored and factorized, so the cost grows with the bandwidth
+    (reduced by the renumbering of the nodes in Linear).
+    """
+    name = 'banded'
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.bandwidth = 0 # Number of diagonals above the main diagonal
+        self.factor: NDArray[float64] | None = None
+
+    def factorize(self, matrix: NDArray[float64] | sp.spmatrix) -> None:
+        matrix = sp.coo_matrix(matrix)
+        self.order = matrix.shape[0]
+
+        # Upper band in the LAPACK storage: band[bandwidth + i - j, j] = matrix[i, j]
+        upper = matrix.row <= matrix.col
+        rows = matrix.row[upper]
+        columns = matrix.col[upper]
+        self.bandwidth = int(np.max(columns - rows, initial=0))
+        band = np.zeros([self.bandwidth + 1, self.order])
+        np.add.at(band, (self.bandwidth + rows - columns, columns), matrix.data[upper])
+
+        # Raises LinAlgError if the matrix is not positive definite
+        self.factor = sla.cholesky_banded(band, lower=False, check_finite=False)
+
+    def solve(self, rhs: NDArray[float64]) -> NDArray[float64]:
+        if self.factor is None:
+            raise ValueError('The matrix was not factorized')
+
+        return sla.cho_solve_banded((self.factor, False), rhs, check_finite=False)
+
+
+class SparseLUSolver(Solver):
+    """Sparse LU factorization with SuperLU"""
+    name = 'sparse_lu'
+    permc_spec: str = 'COLAMD' # Fill reducing ordering of the columns
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.factor: Any = None # SuperLU object of the factorization
+
+    def factorize(self, matrix: NDArray[float64] | sp.spmatrix) -> None:
+        matrix = sp.csc_matrix(matrix)
+        self.order = matrix.shape[0]
+        try:
+            self.factor = splu(matrix, permc_spec=self.permc_spec)
+        except RuntimeError as error: # SuperLU reports singular matrices as RuntimeError
+            raise np.linalg.LinAlgError(str(error)) from error
+
+    def solve(self, rhs: NDArray[float64]) -> NDArray[float64]:
+        if self.factor is None:
+            raise ValueError('The matrix was not factorized')
+
+        return self.factor.solve(np.asarray(rhs, dtype=float64))
+
+
+class SparseCholeskySolver(SparseLUSolver):
+    """Sparse factorization for symmetric positive definite matrices
+
+    SuperLU in symmetric mode: symmetric fill reducing ordering (minimum degree on A^T + A) and
+    pivots taken only from the diagonal, so the factorization is L·D·L^T. The matrix is positive
+    definite only if every pivot is positive.
+
+    The ordering found is kept in self.permutation; when it is given before the factorization
+    (same sparsity pattern), the permuted matrix is factorized in its natural order and the
+    minimum degree ordering is skipped.
+    """
+    name = 'sparse_cholesky'
+    permc_spec = 'MMD_AT_PLUS_A'
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.permuted = False # The factor is of matrix[permutation][:, permutation]
+
+    def factorize(self, matrix: NDArray[float64] | sp.spmatrix) -> None:
+        matrix = sp.csc_matrix(matrix)
+        self.order = matrix.shape[0]
+        self.permuted = self.permutation is not None and self.permutation.size == self.order
+        if self.permuted:
+            matrix = sp.csc_matrix(matrix[self.permutation][:, self.permutation])
+        try:
+            self.factor = splu(matrix,
+                               permc_spec='NATURAL' if self.permuted else self.permc_spec,
+                               diag_pivot_thresh=0.0,
+                               options={'SymmetricMode': True})
+        except RuntimeError as error:
+            raise np.linalg.LinAlgError(str(error)) from error
+
+        if np.any(self.factor.U.diagonal() <= 0) or \
+            np.any(self.factor.perm_r != self.factor.perm_c):
+            self.factor = None
+            raise np.linalg.LinAlgError('Matrix is not positive definite')
+
+        if not self.permuted:
+            self.permutation = np.argsort(self.factor.perm_c)
+
+    def solve(self, rhs: NDArray[float64]) -> NDArray[float64]:
+        if not self.permuted:
+            return super().solve(rhs)
+        if self.factor is None:
+            raise ValueError('The matrix was not factorized')
+
+        rhs = np.asarray(rhs, dtype=float64)
+        solution = np.empty_like(rhs)
+        solution[self.permutation] = self.factor.solve(rhs[self.permutation])
+        return solution
+
+
+class ConjugateGradientSolver(Solver):
+    """Preconditioned conjugate gradient for symmetric positive definite matrices
+
+    Only the matrix and the preconditioner are stored, so very large models fit in memory when
+    the direct factorizations do not. All the right hand sides are iterated together (one
+    matrix product per iteration); each one stops when its relative residual reaches tol.
+    Mechanisms are detected only when the loads excite them (loss of positive curvature or no
+    convergence).
+    """
+    name = 'pcg'
+    iterative = True
+
+    def __init__(self, preconditioner: PreconditionerType = 'incomplete_cholesky',
+                 tol: float = 1e-10, maxiter: int | None = None, drop_tol: float = 1e-3,
+                 fill_factor: float = 10):
+        """Preconditioned conjugate gradient
+
+        Args:
+            preconditioner (PreconditionerType, optional): 'jacobi' (diagonal), 'block_jacobi'
+                (6x6 blocks of the nodes in self.nodes) or 'incomplete_cholesky' (incomplete
+                factorization). Defaults to 'incomplete_cholesky'.
+            tol (float, optional): Relative residual ||b - A·x|| / ||b|| to stop.
+                Defaults to 1e-10.
+            maxiter (int | None, optional): Maximum number of iterations. None uses 10 times the
+                order of the matrix. Defaults to None.
+            drop_tol (float, optional): Drop tolerance of the incomplete factorization.
+                Defaults to 1e-3.
+            fill_factor (float, optional): Maximum fill of the incomplete factorization relative
+                to the matrix. Defaults to 10.
+        """
+        super().__init__()
+        if preconditioner not in ('jacobi', 'block_jacobi', 'incomplete_cholesky'):
+            raise ValueError(f"Unknown preconditioner '{preconditioner}'. Use one of: jacobi, "
+                             "block_jacobi, incomplete_cholesky")
+        self.preconditioner = preconditioner
+        self.tol = tol
+        self.maxiter = maxiter
+        self.drop_tol = drop_tol
+        self.fill_factor = fill_factor
+        self.matrix: sp.csr_matrix | None = None
+        self.apply_preconditioner: Preconditioner | None = None
+        self.iterations: NDArray[np.int64] = np.array([], dtype=np.int64) # By right hand side
+        self.residuals: NDArray[float64] = np.array([]) # Final relative residuals by rhs
+        self.residuals_history: list[NDArray[float64]] = [] # Relative residuals by iteration
+
+    def factorize(self, matrix: NDArray[float64] | sp.spmatrix) -> None:
+        self.matrix = sp.csr_matrix(matrix, dtype=float64)
+        self.order = self.matrix.shape[0]
+
+        if self.preconditioner == 'jacobi':
+            self.apply_preconditioner = self.jacobi()
+        elif self.preconditioner == 'block_jacobi':
+            self.apply_preconditioner = self.block_jacobi()
+        else:
+            self.apply_preconditioner = self.incomplete_cholesky()
+
+    def jacobi(self) -> Preconditioner:
+        """Inverse of the diagonal of the matrix"""
+        if self.matrix is None:
+            raise ValueError('The matrix was not factorized')
+
+        diagonal = self.matrix.diagonal()
+        if np.any(diagonal <= 0):
+            raise np.linalg.LinAlgError('Matrix is not positive definite')
+        inverse = 1 / diagonal
+
+        return lambda residual: inverse[:, np.newaxis] * residual
+
+    def block_jacobi(self) -> Preconditioner:
+        """Inverses of the diagonal blocks of the nodes (6x6, smaller with fixed DOFs)"""
+        if self.matrix is None:
+            raise ValueError('The matrix was not factorized')
+
+        nodes = np.arange(self.order) // 6 if self.nodes is None else np.asarray(self.nodes)
+
+        # Block and position in the block of each equation
+        order = np.argsort(nodes, kind='stable')
+        _, inverse, counts = np.unique(nodes, return_inverse=True, return_counts=True)
+        local = np.empty(self.order, dtype=np.int64)
+        local[order] = np.arange(self.order) - np.repeat(np.cumsum(counts) - counts, counts)
+        inverse = inverse.ravel()
+
+        size = int(np.max(counts, initial=1))
+        blocks = np.zeros([counts.size, size, size])
+        matrix = self.matrix.tocoo()
+        same = inverse[matrix.row] == inverse[matrix.col]
+        np.add.at(blocks,
+                  (inverse[matrix.row[same]], local[matrix.row[same]], local[matrix.col[same]]),
+                  matrix.data[same])
+
+        # Padding of the blocks smaller than size: identity, so it does not mix the equations
+        padding = np.arange(size) >= counts[:, np.newaxis]
+        blocks[padding, np.flatnonzero(padding) % size] = 1.0
+        try:
+            blocks_inverse = np.linalg.inv(blocks)
+        except np.linalg.LinAlgError as error:
+            raise np.linalg.LinAlgError('Singular block of a node') from error
+
+        def apply(residual: NDArray[float64]) -> NDArray[float64]:
+            grouped = np.zeros([counts.size, size, residual.shape[1]])
+            grouped[inverse, local] = residual
+            return (blocks_inverse @ grouped)[inverse, local]
+
+        return apply
+
+    def incomplete_cholesky(self) -> Preconditioner:
+        """Incomplete L·D·L^T factorization
+
+        SciPy has no incomplete Cholesky: the threshold ILU of SuperLU in symmetric mode gives L
+        and D (diagonal of U), and the preconditioner uses only L·D·L^T so it stays symmetric
+        positive definite as the conjugate gradient requires.
+        """
+        if self.matrix is None:
+            raise ValueError('The matrix was not factorized')
+
+        try:
+            factor = spilu(self.matrix.tocsc(), drop_tol=self.drop_tol,
+                           fill_factor=self.fill_factor, permc_spec='MMD_AT_PLUS_A',
+                           diag_pivot_thresh=0.0, options={'SymmetricMode': True})
+        except RuntimeError as error:
+            raise np.linalg.LinAlgError(str(error)) from error
+
+        diagonal = factor.U.diagonal()
+        if np.any(diagonal <= 0) or np.any(factor.perm_r != factor.perm_c):
+            raise np.linalg.LinAlgError('Matrix is not positive definite')
+
+        # Equations in the order of the factorization: matrix[order][:, order] ≈ L·D·L^T
+        order = np.argsort(factor.perm_r)
+        lower = factor.L.tocsr()
+        upper = factor.L.T.tocsr()
+
+        def apply(residual: NDArray[float64]) -> NDArray[float64]:
+            y = spsolve_triangular(lower, residual[order], lower=True, unit_diagonal=True)
+            preconditioned = np.empty_like(residual)
+            preconditioned[order] = spsolve_triangular(upper, y / diagonal[:, np.newaxis],
+                                                       lower=False, unit_diagonal=True)
+            return preconditioned
+
+        return apply
+
+    def solve(self, rhs: NDArray[float64]) -> NDArray[float64]:
+        if self.matrix is None or self.apply_preconditioner is None:
+            raise ValueError('The matrix was not factorized')
+
+        rhs = np.asarray(rhs, dtype=float64)
+        b = rhs.reshape(self.order, -1)
+        maxiter = 10 * self.order if self.maxiter is None else self.maxiter
+
+        b_norm = np.linalg.norm(b, axis=0)
+        b_norm[b_norm == 0] = 1.0
+
+        x = np.zeros_like(b)
+        r = b.copy()
+        z = self.apply_preconditioner(r)
+        p = z.copy()
+        rz = np.sum(r * z, axis=0)
+
+        self.iterations = np.zeros(b.shape[1], dtype=np.int64)
+        self.residuals = np.linalg.norm(r, axis=0) / b_norm
+        self.residuals_history = [self.residuals.copy()]
+        active = np.flatnonzero(self.residuals > self.tol)
+
+        for _ in range(maxiter):
+            if not active.size:
+                break
+
+            q = self.matrix @ p[:, active]
+            pq = np.sum(p[:, active] * q, axis=0)
+            if np.any(pq <= 0):
+                raise np.linalg.LinAlgError('Matrix is not positive definite')
+
+            alpha = rz[active] / pq
+            x[:, active] += alpha * p[:, active]
+            r[:, active] -= alpha * q
+            self.iterations[active] += 1
+            self.residuals[active] = np.linalg.norm(r[:, active], axis=0) / b_norm[active]
+            self.residuals_history.append(self.residuals.copy())
+
+            z = self.apply_preconditioner(r[:, active])
+            rz_new = np.sum(r[:, active] * z, axis=0)
+            p[:, active] = z + rz_new / rz[active] * p[:, active]
+            rz[active] = rz_new
+
+            active = active[self.residuals[active] > self.tol]
+
+        if active.size:
+            raise np.linalg.LinAlgError(
+                f'Conjugate gradient did not converge in {maxiter} iterations '
+                f'(relative residual {np.max(self.residuals):.3e}, tol {self.tol:.1e})')
+
+        return x.reshape(rhs.shape)
+
+
+def matrix_difference(matrix: NDArray[float64] | sp.spmatrix,
+                      base_matrix: NDArray[float64] | sp.spmatrix) -> tuple[NDArray[np.int64],
+                                                                            NDArray[float64]]:
+    """Equations changed between two symmetric matrices of the same order
+
+    Args:
+        matrix (NDArray[float64] | sp.spmatrix): New matrix
+        base_matrix (NDArray[float64] | sp.spmatrix): Factorized matrix
+
+    Returns:
+        tuple[NDArray[np.int64], NDArray[float64]]: Changed equations (m,) and the difference
+            of the matrices in them (m, m)
+    """
+    if sp.issparse(matrix) or sp.issparse(base_matrix):
+        difference = sp.csr_matrix(matrix - base_matrix)
+        difference.eliminate_zeros()
+        equations = np.unique(difference.nonzero()[0])
+        return equations, difference[equations][:, equations].toarray()
+
+    difference = np.asarray(matrix - base_matrix)
+    equations = np.flatnonzero(np.any(difference != 0, axis=1))
+    return equations, difference[np.ix_(equations, equations)]
+
+
+class LowRankUpdateSolver(Solver):
+    """Factorization of a matrix updated by a low rank change (Woodbury identity)
+
+    The new matrix is A + E·D·E^T, where A is the matrix factorized by the base solver, E
+    selects the m changed equations and D is the difference in them. With Z = A^-1·E:
+
+        (A + E·D·E^T)^-1 = A^-1 - Z·(I + D·E^T·Z)^-1·D·E^T·A^-1
+
+    so the update costs m solutions with the base factorization and one m x m factorization,
+    and D does not need to be invertible.
+    """
+    name = 'low_rank_update'
+
+    def __init__(self, base: Solver, base_matrix: NDArray[float64] | sp.spmatrix,
+                 equations: NDArray[np.int64], difference: NDArray[float64]):
+        """Factorization of a matrix updated by a low rank change
+
+        Args:
+            base (Solver): Solver with the factorization of base_matrix
+            base_matrix (NDArray[float64] | sp.spmatrix): Factorized matrix
+            equations (NDArray[np.int64]): Changed equations (m,)
+            difference (NDArray[float64]): Difference of the matrices in the equations (m, m)
+        """
+        super().__init__()
+        self.base = base
+        self.base_matrix = base_matrix
+        self.equations = np.asarray(equations, dtype=np.int64)
+        self.difference = np.asarray(difference, dtype=float64)
+        self.rank = self.equations.size
+        self.z: NDArray[float64] | None = None # A^-1·E (order, m)
+        self.lu_piv: tuple[NDArray[float64], NDArray[np.int32]] | None = None
+
+    def factorize(self, matrix: NDArray[float64] | sp.spmatrix) -> None:
+        self.order = matrix.shape[0]
+        if self.order != self.base.order:
+            raise ValueError('The matrix and the base factorization have different orders')
+
+        selection = np.zeros([self.order, self.rank])
+        selection[self.equations, np.arange(self.rank)] = 1.0
+        self.z = np.asarray(self.base.solve(selection), dtype=float64).reshape(selection.shape)
+
+        # Capacitance matrix: I + D·E^T·A^-1·E
+        capacitance = np.eye(self.rank) + self.difference @ self.z[self.equations]
+        with warnings.catch_warnings(): # Singular matrices are reported below
+            warnings.simplefilter('ignore', sla.LinAlgWarning)
+            lu, piv = sla.lu_factor(capacitance, check_finite=False)
+        if np.any(np.diag(lu) == 0) or not np.all(np.isfinite(lu)) or \
+            np.linalg.cond(capacitance) > CAPACITANCE_MAX_CONDITION:
+            raise np.linalg.LinAlgError('Singular matrix')
+
+        self.lu_piv = (lu, piv)
+
+    def solve(self, rhs: NDArray[float64]) -> NDArray[float64]:
+        if self.z is None or self.lu_piv is None:
+            raise ValueError('The matrix was not factorized')
+
+        rhs = np.asarray(rhs, dtype=float64)
+        x = np.asarray(self.base.solve(rhs), dtype=float64).reshape(rhs.shape)
+        correction = sla.lu_solve(self.lu_piv, self.difference @ x[self.equations],
+                                  check_finite=False)
+
+        return x - self.z @ correction
+
+    def copy(self) -> Solver:
+        solver = copy.copy(self)
+        solver.base = self.base.copy()
+        return solver
+
+
+SOLVERS: dict[str, type[Solver]] = {
+    DenseSolver.name: DenseSolver,
+    BandedCholeskySolver.name: BandedCholeskySolver,
+    SparseLUSolver.name: SparseLUSolver,
+    SparseCholeskySolver.name: SparseCholeskySolver,
+    ConjugateGradientSolver.name: ConjugateGradientSolver,
+}
+
+
+def select_solver(matrix: NDArray[float64] | sp.spmatrix,
+                  solver: SolverType | Solver = 'auto') -> Solver:
+    """Choose the solver for the matrix of the system
+
+    The automatic choice uses the dense solver for dense, small or dense-filled matrices and
+    the sparse Cholesky otherwise (the stiffness matrix is symmetric positive definite).
+
+    Args:
+        matrix (NDArray[float64] | sp.spmatrix): Matrix of the system
+        solver (SolverType | Solver, optional): Name or instance of the solver. Defaults to 'auto'.
+
+    Raises:
+        ValueError: If the name of the solver is unknown
+
+    Returns:
+        Solver: Solver (not factorized)
+    """
+    if isinstance(solver, Solver):
+        return solver
+
+    if solver == 'auto':
+        order = matrix.shape[0]
+        if isinstance(matrix, np.ndarray) or order <= DENSE_MAX_ORDER or \
+            matrix.nnz / order**2 >= DENSE_MIN_DENSITY:
+            return DenseSolver()
+        return SparseCholeskySolver()
+
+    if solver not in SOLVERS:
+        raise ValueError(f"Unknown solver '{solver}'. Use one of: auto, {', '.join(SOLVERS)}")
+
+    return SOLVERS[solver]()
@@ -0,0 +1,158 @@
+"""Deflected shape of many bars and load cases at stations
+
+The displacements along a bar are the cubic Hermite interpolation of the displacements of its
+ends in local axes (homogeneous solution of the Euler-Bernoulli beam) plus the deflections of
+the bar with fixed ends under its span loads (particular solution). With ξ = x / L:
+    u = (1 - ξ)·ua + ξ·ub
+    v = H1·va + H2·rza + H3·vb + H4·rzb
+    w = H1·wa - H2·rya + H3·wb - H4·ryb
+    H1 = 1 - 3ξ² + 2ξ³     H2 = L·(ξ - 2ξ² + ξ³)     H3 = 3ξ² - 2ξ³     H4 = L·(ξ³ - ξ²)
+The particular solution is calculated only for the bars with loads in the load case, by the
+piecewise polynomials of "piecewise" with the fixed end forces and null end displacements.
+"""
+import numpy as np
+from numpy import float64
+from numpy.typing import NDArray
+
+from ....types import BarsDistLoads, BarsPtLoads
+from . import piecewise
+
+# Signs of the local end forces in the sign convention of bar.extreme_forces
+_END_SIGNS = np.array([-1.0,  1.0,  1.0,  1.0,  1.0, -1.0,
+                        1.0, -1.0, -1.0, -1.0, -1.0,  1.0])
+
+
+def hermite(lengths: NDArray[float64], positions: NDArray[float64]) -> NDArray[float64]:
+    """Cubic Hermite shape functions at the stations of the bars
+
+    Args:
+        lengths (NDArray[float64]): Length of the bars (nbars,)
+        positions (NDArray[float64]): Stations of each bar (nbars, nstations)
+
+    Returns:
+        NDArray[float64]: H1, H2, H3, H4 at the stations (nbars, nstations, 4)
+    """
+    lengths = np.asarray(lengths, dtype=float64)[:, np.newaxis]
+    xi = np.asarray(positions, dtype=float64) / lengths
+    xi2 = xi * xi
+    xi3 = xi2 * xi
+
+    return np.stack([1 - 3 * xi2 + 2 * xi3,
+                     lengths * (xi - 2 * xi2 + xi3),
+                     3 * xi2 - 2 * xi3,
+                     lengths * (xi3 - xi2)], axis=-1)
+
+def interpolation(lengths: NDArray[float64], positions: NDArray[float64],
+                  end_displacements: NDArray[float64]) -> NDArray[float64]:
+    """Displacements at the stations interpolated from the ends of the bars (no span loads)
+
+    Args:
+        lengths (NDArray[float64]): Length of the bars (nbars,)
+        positions (NDArray[float64]): Stations of each bar (nbars, nstations)
+        end_displacements (NDArray[float64]): Displacements of the ends of the bars in local
+            coordinates (nloads, nbars, 12)
+
+    Returns:
+        NDArray[float64]: u, v, w in local axes (nloads, nbars, nstations, 3)
+    """
+    shape = hermite(lengths, positions)
+    xi = np.asarray(positions, dtype=float64) / np.asarray(lengths, dtype=float64)[:, np.newaxis]
+
+    # End DOFs of v and w in the order of H1, ..., H4 (nloads, nbars, 4, 1)
+    d = np.asarray(end_displacements, dtype=float64)
+    axial = d[..., 0, np.newaxis] + xi * (d[..., 6, np.newaxis] - d[..., 0, np.newaxis])
+    transversal_y = shape @ d[..., [1, 5, 7, 11], np.newaxis]
+    transversal_z = shape @ (d[..., [2, 4, 8, 10], np.newaxis] *
+                             np.array([1.0, -1.0, 1.0, -1.0])[:, np.newaxis])
+
+    return np.concatenate([axial[..., np.newaxis], transversal_y, transversal_z], axis=-1)
+
+def fixed_end_deflections(lengths: NDArray[float64],
+                          positions: NDArray[float64],
+                          loads_vectors: NDArray[float64],
+                          rigidities: NDArray[float64],
+                          point_loads: BarsPtLoads,
+                          distributed_loads: BarsDistLoads) -> NDArray[float64]:
+    """Deflections at the stations of the bars with fixed ends under the span loads
+
+    Args:
+        lengths (NDArray[float64]): Length of the bars (nbars,)
+        positions (NDArray[float64]): Stations of each bar (nbars, nstations)
+        loads_vectors (NDArray[float64]): Equivalent nodal loads of the bars in local
+            coordinates, without condensation (nloads, nbars, 12)
+        rigidities (NDArray[float64]): EA, EIy and EIz of the bars (nbars, 3)
+        point_loads (BarsPtLoads): Point loads in local coordinates
+        distributed_loads (BarsDistLoads): Distributed loads in local coordinates
+
+    Returns:
+        NDArray[float64]: u, v, w in local axes (nloads, nbars, nstations, 3)
+    """
+    lengths = np.asarray(lengths, dtype=float64)
+    positions = np.asarray(positions, dtype=float64)
+    nloads, nbars = loads_vectors.shape[:2]
+    deflections = np.zeros([nloads * nbars, positions.shape[1], 3])
+
+    # Groups (load_index · nbars + bar_index) with loads, each one a bar of a single load case
+    point_groups = np.asarray(point_loads.load_index * nbars + point_loads.bar_index,
+                              dtype=np.int64)
+    distributed_groups = np.asarray(distributed_loads.load_index * nbars +
+                                    distributed_loads.bar_index, dtype=np.int64)
+    loaded = np.unique(np.concatenate([point_groups, distributed_groups]))
+    if loaded.size == 0:
+        return deflections.reshape(nloads, nbars, *deflections.shape[1:])
+
+    bars = loaded % nbars
+    point_loads = point_loads._replace(load_index=np.zeros_like(point_groups),
+                                       bar_index=np.searchsorted(loaded, point_groups))
+    distributed_loads = distributed_loads._replace(
+        load_index=np.zeros_like(distributed_groups),
+        bar_index=np.searchsorted(loaded, distributed_groups))
+
+    # Fixed end forces: the reactions (opposite of the equivalent nodal loads)
+    end_forces = -loads_vectors.reshape(-1, 12)[loaded][np.newaxis] * _END_SIGNS
+    indptr, starts, _, _, coefficients = piecewise.member_response(
+        lengths[bars], end_forces, np.zeros_like(end_forces),
+        np.asarray(rigidities, dtype=float64)[bars], point_loads, distributed_loads)
+
+    x = positions[bars].ravel()
+    groups = np.repeat(np.arange(loaded.size), positions.shape[1])
+    segments = piecewise.segment_search(indptr, starts, groups, x)
+    deflections[loaded] = piecewise.evaluate(coefficients[segments],
+                                             x - starts[segments]).reshape(loaded.size, -1, 3)
+
+    return deflections.reshape(nloads, nbars, *deflections.shape[1:])
+
+def deflected_shape(lengths: NDArray[float64],
+                    positions: NDArray[float64],
+                    end_displacements: NDArray[float64],
+                    loads_vectors: NDArray[float64],
+                    rigidities: NDArray[float64],
+                    point_loads: BarsPtLoads,
+                    distributed_loads: BarsDistLoads) -> NDArray[float64]:
+    """Displacements at the stations of all bars and load cases
+
+    Args:
+        lengths (NDArray[float64]): Length of the bars (nbars,)
+        positions (NDArray[float64]): Stations of each bar (nbars, nstations)
+        end_displacements (NDArray[float64]): Displacements of the ends of the bars in local
+            coordinates, released DOFs included (nloads, nbars, 12)
+        loads_vectors (NDArray[float64]): Equivalent nodal loads of the bars in local
+            coordinates, without condensation (nloads, nbars, 12)
+        rigidities (NDArray[float64]): EA, EIy and EIz of the bars (nbars, 3)
+        point_loads (BarsPtLoads): Point loads in local coordinates
+        distributed_loads (BarsDistLoads): Distributed loads in local coordinates
+
+    Raises:
+        ValueError: If a station is out of the bar
+
+    Returns:
+        NDArray[float64]: u, v, w in local axes (nloads, nbars, nstations, 3)
+    """
+    lengths = np.asarray(lengths, dtype=float64)
+    positions = np.asarray(positions, dtype=float64)
+    if np.any(positions < 0) or np.any(positions > lengths[:, np.newaxis]):
+        raise ValueError('Position x is out of bounds')
+
+    return interpolation(lengths, positions, end_displacements) + \
+        fixed_end_deflections(lengths, positions, loads_vectors, rigidities, point_loads,
+                              distributed_loads)
@@ -0,0 +1,271 @@
+"""Diagrams of the internal forces of many bars and load cases at once
+
+The internal forces follow the signs of "point_load" (end forces in the sign convention of
+bar.extreme_forces):
+    N = N_a - sum(Fx)                     T = T_a + sum(Mx)
+    Vy = Vy_a + sum(Fy)                   My = My_a + sum(My) + integral(Vz)
+    Vz = Vz_a + sum(Fz)                   Mz = Mz_a - sum(Mz) + integral(Vy)
+where the sums are over the loads before the station. Each load is an event in its bar with a
+polynomial in the position of the station: a point load is a step and a distributed load is a
+ramp that starts at x1 plus the opposite ramp at x2. The events are sorted by position and the
+polynomials are summed with prefix sums, so a station only reads the sum of the events before
+it.
+"""
+from typing import Literal
+
+import numpy as np
+from numpy import float64
+from numpy.typing import NDArray
+
+from ....types import BarsDistLoads, BarsPtLoads
+
+# Components of the diagrams
+DIAGRAMS = ('N', 'Vy', 'Vz', 'T', 'My', 'Mz')
+
+# Sign of each component of the loads (Fx, Fy, Fz, Mx, My, Mz) in its diagram (N, ..., Mz)
+_LOADS_SIGNS = np.array([-1.0, 1.0, 1.0, 1.0, 1.0, -1.0])
+
+
+def stations(lengths: NDArray[float64], number: int) -> NDArray[float64]:
+    """Equally spaced stations of the bars, ends included
+
+    Args:
+        lengths (NDArray[float64]): Length of the bars (nbars,)
+        number (int): Number of stations of each bar (at least 2)
+
+    Raises:
+        ValueError: If the number of stations is less than 2
+
+    Returns:
+        NDArray[float64]: Positions of the stations (nbars, number)
+    """
+    if number < 2:
+        raise ValueError('The diagrams need at least 2 stations (the ends of the bar)')
+
+    return np.asarray(lengths, dtype=float64)[:, np.newaxis] * np.linspace(0, 1, number)
+
+def diagrams(lengths: NDArray[float64],
+             positions: NDArray[float64],
+             end_forces: NDArray[float64],
+             point_loads: BarsPtLoads,
+             distributed_loads: BarsDistLoads,
+             side: Literal['left', 'right'] = 'right') -> NDArray[float64]:
+    """Internal forces at the stations of all bars and load cases
+
+    Args:
+        lengths (NDArray[float64]): Length of the bars (nbars,)
+        positions (NDArray[float64]): Stations of each bar (nbars, nstations)
+        end_forces (NDArray[float64]): End forces of the bars in local coordinates with the
+            signs of bar.extreme_forces (nloads, nbars, 12)
+        point_loads (BarsPtLoads): Point loads in local coordinates
+        distributed_loads (BarsDistLoads): Distributed loads in local coordinates
+        side (Literal['left', 'right'], optional): Value at a point load or at the end of a
+            distributed load: 'left' before the load and 'right' after the load. Defaults to
+            'right'.
+
+    Raises:
+        ValueError: If a station or a load is out of the bar or side is not 'left' or 'right'
+
+    Returns:
+        NDArray[float64]: N, Vy, Vz, T, My, Mz at the stations (nloads, nbars, nstations, 6)
+    """
+    lengths = np.asarray(lengths, dtype=float64)
+    positions = np.asarray(positions, dtype=float64)
+    nloads, nbars = end_forces.shape[:2]
+    if np.any(positions < 0) or np.any(positions > lengths[:, np.newaxis]):
+        raise ValueError('Position x is out of bounds')
+
+    # End forces: constant forces and moments plus the moments of the shears of the start
+    nstations = positions.shape[1]
+    values = np.repeat(end_forces[:, :, np.newaxis, :6], nstations, axis=2)
+    values[..., 4] += end_forces[:, :, np.newaxis, 2] * positions
+    values[..., 5] += end_forces[:, :, np.newaxis, 1] * positions
+
+    # Loads: only the stations of the loaded groups (load case and bar)
+    _validate(lengths, point_loads, distributed_loads, side)
+    loaded = np.unique(np.concatenate([point_loads.load_index * nbars + point_loads.bar_index,
+                                       distributed_loads.load_index * nbars +
+                                       distributed_loads.bar_index]))
+    x = positions[loaded % nbars]
+    coefficients = _loads_polynomials(np.repeat(loaded, nstations), x.ravel(), nloads, nbars,
+                                      point_loads, distributed_loads, side)
+    values.reshape(nloads * nbars, nstations, 6)[loaded] += \
+        (coefficients * (x.reshape(-1, 1, 1) ** np.arange(4))).sum(axis=-1) \
+        .reshape(loaded.size, nstations, 6)
+
+    return values
+
+def polynomials(lengths: NDArray[float64],
+                groups: NDArray[np.int64],
+                positions: NDArray[float64],
+                end_forces: NDArray[float64],
+                point_loads: BarsPtLoads,
+                distributed_loads: BarsDistLoads,
+                side: Literal['left', 'right'] = 'right') -> NDArray[float64]:
+    """Polynomials of the internal forces valid at the positions
+
+    Each position gets the coefficients of the powers of x (x^0 to x^3) of N, Vy, Vz, T, My
+    and Mz between its neighbouring loads, so the polynomial holds up to the next load.
+
+    Args:
+        lengths (NDArray[float64]): Length of the bars (nbars,)
+        groups (NDArray[np.int64]): Load case and bar of each position
+            (load_index · nbars + bar_index), (n,)
+        positions (NDArray[float64]): Positions in the bars (n,)
+        end_forces (NDArray[float64]): End forces of the bars in local coordinates with the
+            signs of bar.extreme_forces (nloads, nbars, 12)
+        point_loads (BarsPtLoads): Point loads in local coordinates
+        distributed_loads (BarsDistLoads): Distributed loads in local coordinates
+        side (Literal['left', 'right'], optional): Polynomial at a point load or at the end of
+            a distributed load: 'left' before the load and 'right' after the load. Defaults to
+            'right'.
+
+    Raises:
+        ValueError: If a load is out of the bar or side is not 'left' or 'right'
+
+    Returns:
+        NDArray[float64]: Coefficients of the powers of x (n, 6, 4)
+    """
+    lengths = np.asarray(lengths, dtype=float64)
+    groups = np.asarray(groups, dtype=np.int64)
+    positions = np.asarray(positions, dtype=float64)
+    nloads, nbars = end_forces.shape[:2]
+    _validate(lengths, point_loads, distributed_loads, side)
+
+    # Loads plus the end forces (constant forces and moments and moments of the shears of the
+    # start)
+    coefficients = _loads_polynomials(groups, positions, nloads, nbars,
+                                      point_loads, distributed_loads, side)
+    forces = end_forces.reshape(nloads * nbars, 12)[groups]
+    coefficients[:, :, 0] += forces[:, :6]
+    coefficients[:, 4, 1] += forces[:, 2]
+    coefficients[:, 5, 1] += forces[:, 1]
+
+    return coefficients
+
+def events(point_loads: BarsPtLoads, distributed_loads: BarsDistLoads,
+           nbars: int) -> tuple[NDArray[float64], NDArray[float64], NDArray[np.int64]]:
+    """Events of the loads: steps of the point loads and ramps of the distributed loads
+
+    Args:
+        point_loads (BarsPtLoads): Point loads in local coordinates
+        distributed_loads (BarsDistLoads): Distributed loads in local coordinates
+        nbars (int): Number of bars
+
+    Returns:
+        tuple[NDArray[float64], NDArray[float64], NDArray[np.int64]]: Position, coefficients of
+            the powers of x of N, Vy, Vz, T, My, Mz after the event (nevents, 6, 4) and group
+            (load_index · nbars + bar_index) of the events
+    """
+    # Point loads: step F·H(x - a) and moment of the forces F·(x - a)·H(x - a)
+    a = point_loads.position
+    point_coefficients = np.zeros([a.size, 6, 4])
+    point_coefficients[:, :, 0] = point_loads.values * _LOADS_SIGNS
+    for force, moment in ((2, 4), (1, 5)): # Fz -> My and Fy -> Mz
+        point_coefficients[:, moment, 0] -= point_loads.values[:, force] * a
+        point_coefficients[:, moment, 1] += point_loads.values[:, force]
+
+    # Distributed loads: ramp p1 + k·(s - x1) from x1 and ramp -p2 - k·(s - x2) from x2
+    x1, x2 = distributed_loads.x1, distributed_loads.x2
+    k = (distributed_loads.p2 - distributed_loads.p1) / (x2 - x1)[:, np.newaxis]
+    ramps_positions = np.concatenate([x1, x2])
+    ramps_c0 = np.concatenate([distributed_loads.p1, -distributed_loads.p2])
+    ramps_c1 = np.concatenate([k, -k])
+    ramp_coefficients = _ramps(ramps_positions, ramps_c0, ramps_c1)
+
+    positions = np.concatenate([a, ramps_positions])
+    coefficients = np.concatenate([point_coefficients, ramp_coefficients])
+    groups = np.concatenate([point_loads.load_index * nbars + point_loads.bar_index,
+                             np.tile(distributed_loads.load_index * nbars +
+                                     distributed_loads.bar_index, 2)])
+
+    return positions, coefficients, groups
+
+def _validate(lengths: NDArray[float64], point_loads: BarsPtLoads,
+              distributed_loads: BarsDistLoads, side: str) -> None:
+    """Verifies the side and the positions of the loads"""
+    if side not in ('left', 'right'):
+        raise ValueError('Side only "left" and "right"')
+    if np.any((point_loads.position < 0) |
+              (point_loads.position > lengths[point_loads.bar_index])) or \
+       np.any((distributed_loads.x1 < 0) | (distributed_loads.x1 >= distributed_loads.x2) |
+              (distributed_loads.x2 > lengths[distributed_loads.bar_index])):
+        raise ValueError('Load is out of the bar')
+
+def _loads_polynomials(groups: NDArray[np.int64], positions: NDArray[float64],
+                       nloads: int, nbars: int,
+                       point_loads: BarsPtLoads, distributed_loads: BarsDistLoads,
+                       side: Literal['left', 'right']) -> NDArray[float64]:
+    """Coefficients of the powers of x (n, 6, 4) of the sum of the events before each position"""
+    coefficients = np.zeros([groups.size, 6, 4])
+
+    # Events: position and coefficients of the powers of x of each diagram (nevents, 6, 4)
+    events_positions, events_coefficients, events_groups = events(point_loads,
+                                                                  distributed_loads, nbars)
+    if events_positions.size == 0:
+        return coefficients
+
+    # Loaded groups (load case and bar) and number of their events before each position
+    loaded, events_groups = np.unique(events_groups, return_inverse=True)
+    compact = np.full(nloads * nbars, -1, dtype=np.int64)
+    compact[loaded] = np.arange(loaded.size)
+    queries_groups = compact[groups]
+    is_loaded = queries_groups >= 0
+    counts = _events_before(events_groups, events_positions, queries_groups[is_loaded],
+                            positions[is_loaded], side)
+
+    # Prefix sums of all the events sorted by group and position; the sum of a group is the
+    # difference to the prefix sum at its first event
+    order = np.lexsort((events_positions, events_groups))
+    prefix = np.zeros([order.size + 1, 6, 4])
+    np.cumsum(events_coefficients[order], axis=0, out=prefix[1:])
+    indptr = np.searchsorted(events_groups[order], np.arange(loaded.size))
+
+    start = indptr[queries_groups[is_loaded]]
+    coefficients[is_loaded] = prefix[start + counts] - prefix[start]
+
+    return coefficients
+
+def _ramps(e: NDArray[float64], c0: NDArray[float64],
+           c1: NDArray[float64]) -> NDArray[float64]:
+    """Coefficients of the powers of x (n, 6, 4) of the ramps c0 + c1·(s - e) from s = e"""
+    # Powers of (x - e) in powers of x: (x - e)^n = sum(binomial · x^j · (-e)^(n - j))
+    binomial = np.array([[1, 0, 0, 0], [-1, 1, 0, 0], [1, -2, 1, 0], [-1, 3, -3, 1]],
+                        dtype=float64)
+    powers = e[:, np.newaxis] ** np.array([0, 1, 2, 3])
+    shifted = binomial[np.newaxis] * np.stack( # (n, power of (x - e), power of x)
+        [powers[:, [0, 0, 0, 0]], powers[:, [1, 0, 0, 0]], powers[:, [2, 1, 0, 0]],
+         powers[:, [3, 2, 1, 0]]], axis=1)
+
+    # Resultant c0·(x - e) + c1·(x - e)²/2 and its moment c0·(x - e)²/2 + c1·(x - e)³/6
+    resultant = c0[..., np.newaxis] * shifted[:, np.newaxis, 1] + \
+        c1[..., np.newaxis] * shifted[:, np.newaxis, 2] / 2
+    moment = c0[..., np.newaxis] * shifted[:, np.newaxis, 2] / 2 + \
+        c1[..., np.newaxis] * shifted[:, np.newaxis, 3] / 6
+
+    coefficients = resultant * _LOADS_SIGNS[:, np.newaxis]
+    coefficients[:, 4] += moment[:, 2] # Fz -> My
+    coefficients[:, 5] += moment[:, 1] # Fy -> Mz
+
+    return coefficients
+
+def _events_before(groups: NDArray[np.int64], positions: NDArray[float64],
+                   queries_groups: NDArray[np.int64], queries_positions: NDArray[float64],
+                   side: Literal['left', 'right']) -> NDArray[np.int64]:
+    """Number of events of the group before each query (events and queries with compact
+    groups)"""
+    # Events and queries sorted together by group and position; in a tie the events come
+    # first for the side 'right' (the query includes the load) and last for the side 'left'
+    all_groups = np.concatenate([groups, queries_groups])
+    all_positions = np.concatenate([positions, queries_positions])
+    is_event = np.concatenate([np.ones(groups.size, dtype=np.int64),
+                               np.zeros(queries_groups.size, dtype=np.int64)])
+    tie = is_event if side == 'left' else 1 - is_event
+    order = np.lexsort((tie, all_positions, all_groups))
+
+    # Events before each element of the sorted array minus the events of the previous groups
+    events_before = np.empty(order.size, dtype=np.int64)
+    events_before[order] = np.cumsum(is_event[order])
+    previous_groups = np.concatenate([[0], np.cumsum(np.bincount(groups))])
+
+    return events_before[groups.size:] - previous_groups[queries_groups]
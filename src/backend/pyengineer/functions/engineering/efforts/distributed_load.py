@@ -23,5 +23,3 @@ def shear(x: float, length: float, v1: float, w1: float, w2: float) -> float:
     vx = v1 + w1*x + (x**2 * (w2 - w1)) / (2 * length)
 
     return vx
-
-print(shear(5, 5, -400, 100, 300))
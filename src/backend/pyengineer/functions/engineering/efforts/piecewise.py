@@ -0,0 +1,311 @@
+"""Internal forces and deflections of many bars and load cases as piecewise polynomials
+
+The bar of each load case (group: load_index · nbars + bar_index) is split in segments at the
+point loads and at the ends of the distributed loads. The segments of all groups are stored in
+compact arrays (CSR layout): indptr has the first segment of each group, starts and ends the
+limits of each segment, and the coefficients are in powers of t = x - start:
+    forces (nsegments, 6, 4): N, Vy, Vz, T, My, Mz (cubic at most)
+    deflections (nsegments, 3, 6): u, v, w in local axes (quintic at most)
+with the signs of "point_load" (bar.extreme_forces). A position is found in its group by
+binary search (O(log k) for k segments).
+
+The deflections integrate the Euler-Bernoulli beam equations from the start of the bar:
+    u' = N / EA              v'' = Mz / EIz              w'' = My / EIy
+with the rotations of the start chosen so the deflections match the translations of the end.
+"""
+from typing import Literal
+
+import numpy as np
+from numpy import float64
+from numpy.typing import NDArray
+
+from ....types import BarsDistLoads, BarsPtLoads
+from . import diagrams
+
+
+def breakpoints(lengths: NDArray[float64], nloads: int, point_loads: BarsPtLoads,
+                distributed_loads: BarsDistLoads) -> tuple[NDArray[np.int64],
+                                                          NDArray[float64], NDArray[float64]]:
+    """Segments of the bars of all load cases
+
+    Args:
+        lengths (NDArray[float64]): Length of the bars (nbars,)
+        nloads (int): Number of load cases
+        point_loads (BarsPtLoads): Point loads in local coordinates
+        distributed_loads (BarsDistLoads): Distributed loads in local coordinates
+
+    Returns:
+        tuple[NDArray[np.int64], NDArray[float64], NDArray[float64]]: First segment of each
+            group (nloads · nbars + 1,), start and end of each segment (nsegments,)
+    """
+    lengths = np.asarray(lengths, dtype=float64)
+    nbars = lengths.size
+    ngroups = nloads * nbars
+    positions, _, groups = diagrams.events(point_loads, distributed_loads, nbars)
+
+    # Start of the bar and the loads inside the bar, sorted by group and without repetitions
+    inside = positions < lengths[groups % max(nbars, 1)]
+    groups = np.concatenate([np.arange(ngroups), groups[inside]])
+    positions = np.concatenate([np.zeros(ngroups), positions[inside]])
+    order = np.lexsort((positions, groups))
+    groups, positions = groups[order], positions[order]
+    unique = np.ones(groups.size, dtype=bool)
+    unique[1:] = (groups[1:] != groups[:-1]) | (positions[1:] != positions[:-1])
+    groups, starts = groups[unique], positions[unique]
+
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(groups, minlength=ngroups))])
+    ends = np.append(starts[1:], 0.0)
+    last = indptr[1:] - 1
+    ends[last] = np.tile(lengths, nloads)
+
+    return indptr, starts, ends
+
+def segment_search(indptr: NDArray[np.int64], starts: NDArray[float64],
+                   groups: NDArray[np.int64], positions: NDArray[float64],
+                   side: Literal['left', 'right'] = 'right') -> NDArray[np.int64]:
+    """Segment of each position by binary search in the segments of its group
+
+    Args:
+        indptr (NDArray[np.int64]): First segment of each group (ngroups + 1,)
+        starts (NDArray[float64]): Start of each segment (nsegments,)
+        groups (NDArray[np.int64]): Group of each position (n,)
+        positions (NDArray[float64]): Positions in the bars (n,)
+        side (Literal['left', 'right'], optional): Segment at a breakpoint: 'left' the segment
+            that ends and 'right' the segment that starts. Defaults to 'right'.
+
+    Raises:
+        ValueError: If side is not 'left' or 'right'
+
+    Returns:
+        NDArray[np.int64]: Segment of each position (n,)
+    """
+    if side not in ('left', 'right'):
+        raise ValueError('Side only "left" and "right"')
+
+    first = indptr[groups]
+    low = first.copy()
+    high = indptr[groups + 1]
+    while True:
+        active = low < high
+        if not active.any():
+            break
+        middle = (low + high) // 2
+        start = starts[np.minimum(middle, starts.size - 1)]
+        before = start <= positions if side == 'right' else start < positions
+        low = np.where(active & before, middle + 1, low)
+        high = np.where(active & ~before, middle, high)
+
+    return np.maximum(low - 1, first)
+
+def evaluate(coefficients: NDArray[float64], t: NDArray[float64]) -> NDArray[float64]:
+    """Evaluates polynomials by Horner's method
+
+    Args:
+        coefficients (NDArray[float64]): Coefficients of the powers of t (n, ..., degree + 1)
+        t (NDArray[float64]): Variable of each polynomial (n,)
+
+    Returns:
+        NDArray[float64]: Values of the polynomials (n, ...)
+    """
+    t = np.reshape(t, (-1,) + (1,) * (coefficients.ndim - 2))
+    values = coefficients[..., -1].copy()
+    for power in range(coefficients.shape[-1] - 2, -1, -1):
+        values *= t
+        values += coefficients[..., power]
+    return values
+
+def taylor_shift(coefficients: NDArray[float64], x0: NDArray[float64]) -> NDArray[float64]:
+    """Coefficients of p(x0 + t) in powers of t from the coefficients of p(x) in powers of x
+
+    Args:
+        coefficients (NDArray[float64]): Coefficients of the powers of x (n, ..., degree + 1)
+        x0 (NDArray[float64]): Origin of t of each polynomial (n,)
+
+    Returns:
+        NDArray[float64]: Coefficients of the powers of t (n, ..., degree + 1)
+    """
+    shifted = np.array(coefficients, dtype=float64)
+    x0 = np.reshape(x0, (-1,) + (1,) * (coefficients.ndim - 2))
+
+    # Repeated synthetic division by (t - x0)
+    degree = coefficients.shape[-1] - 1
+    for power in range(degree):
+        for index in range(degree - 1, power - 1, -1):
+            shifted[..., index] += x0 * shifted[..., index + 1]
+    return shifted
+
+def integrate(coefficients: NDArray[float64], times: int = 1) -> NDArray[float64]:
+    """Coefficients of the integral from 0 to t (null constants)
+
+    Args:
+        coefficients (NDArray[float64]): Coefficients of the powers of t (..., degree + 1)
+        times (int, optional): Number of integrations. Defaults to 1.
+
+    Returns:
+        NDArray[float64]: Coefficients of the powers of t (..., degree + 1 + times)
+    """
+    for _ in range(times):
+        powers = np.arange(1, coefficients.shape[-1] + 1)
+        coefficients = np.concatenate([np.zeros_like(coefficients[..., :1]),
+                                       coefficients / powers], axis=-1)
+    return coefficients
+
+def stationary_points(coefficients: NDArray[float64],
+                      size: NDArray[float64]) -> NDArray[float64]:
+    """Roots of the derivative of cubic polynomials inside the segments
+
+    Args:
+        coefficients (NDArray[float64]): Coefficients of the powers of t (n, ..., 4)
+        size (NDArray[float64]): Size of the segment of each polynomial (n,)
+
+    Returns:
+        NDArray[float64]: The two roots of c1 + 2·c2·t + 3·c3·t² (n, ..., 2); roots out of
+            0 < t < size (or complex) are replaced by 0
+    """
+    a = 3 * coefficients[..., 3]
+    b = 2 * coefficients[..., 2]
+    c = coefficients[..., 1]
+    size = np.reshape(size, (-1,) + (1,) * (coefficients.ndim - 2))
+
+    # Stable quadratic formula; a null a (derivative of a parabola) keeps the root c / q
+    with np.errstate(divide='ignore', invalid='ignore'):
+        discriminant = b**2 - 4 * a * c
+        q = -(b + np.where(b >= 0, 1.0, -1.0) * np.sqrt(np.maximum(discriminant, 0))) / 2
+        roots = np.stack([q / a, c / q], axis=-1)
+
+    valid = (discriminant >= 0)[..., np.newaxis] & np.isfinite(roots) & \
+        (roots > 0) & (roots < size[..., np.newaxis])
+    return np.where(valid, roots, 0.0)
+
+def extremes(indptr: NDArray[np.int64], starts: NDArray[float64], ends: NDArray[float64],
+             coefficients: NDArray[float64]) -> tuple[NDArray[float64], NDArray[float64],
+                                                      NDArray[float64], NDArray[float64]]:
+    """Maximum and minimum of cubic piecewise polynomials of each group and their positions
+
+    The candidates of each segment are its two ends (both sides of the breakpoints) and the
+    roots of the derivative inside it (for the moments, the points of null shear).
+
+    Args:
+        indptr (NDArray[np.int64]): First segment of each group (ngroups + 1,)
+        starts (NDArray[float64]): Start of each segment (nsegments,)
+        ends (NDArray[float64]): End of each segment (nsegments,)
+        coefficients (NDArray[float64]): Coefficients of the powers of t = x - start of each
+            segment (nsegments, ncomponents, 4)
+
+    Returns:
+        tuple[NDArray[float64], NDArray[float64], NDArray[float64], NDArray[float64]]: Maximum,
+            its position, minimum and its position of each group and component
+            (ngroups, ncomponents); the first position governs the ties
+    """
+    ngroups = indptr.size - 1
+    ncomponents = coefficients.shape[1]
+    if ngroups == 0:
+        empty = np.zeros([0, ncomponents])
+        return empty, empty.copy(), empty.copy(), empty.copy()
+
+    # Candidates of each segment and component (nsegments, ncomponents, 4)
+    size = ends - starts
+    t = np.concatenate([np.zeros([size.size, ncomponents, 1]),
+                        stationary_points(coefficients, size),
+                        np.broadcast_to(size[:, np.newaxis, np.newaxis],
+                                        (size.size, ncomponents, 1))], axis=-1)
+    values = np.repeat(coefficients[..., 3:], t.shape[-1], axis=-1)
+    for power in (2, 1, 0):
+        values *= t
+        values += coefficients[..., power, np.newaxis]
+    positions = t + starts[:, np.newaxis, np.newaxis]
+
+    results = []
+    segments = np.arange(size.size)
+    first = indptr[:-1]
+    groups = np.repeat(np.arange(ngroups), np.diff(indptr))
+    for argument, reduce in ((np.argmax, np.maximum), (np.argmin, np.minimum)):
+        # Extreme of each segment, then the first segment of the group with the extreme
+        candidate = argument(values, axis=-1)[..., np.newaxis]
+        segment_values = np.take_along_axis(values, candidate, -1)[..., 0]
+        segment_positions = np.take_along_axis(positions, candidate, -1)[..., 0]
+        group_values = reduce.reduceat(segment_values, first, axis=0)
+        governing = np.where(segment_values == group_values[groups],
+                             segments[:, np.newaxis], size.size)
+        governing = np.minimum.reduceat(governing, first, axis=0)
+        results += [group_values,
+                    np.take_along_axis(segment_positions, governing, 0)]
+
+    return results[0], results[1], results[2], results[3]
+
+def _group_sums(values: NDArray[float64], indptr: NDArray[np.int64],
+                groups: NDArray[np.int64]) -> tuple[NDArray[float64], NDArray[float64]]:
+    """Sums of the values of the previous segments of the group (nsegments, ...) and total
+    sums of the groups (ngroups, ...)"""
+    prefix = np.zeros([values.shape[0] + 1, *values.shape[1:]])
+    np.cumsum(values, axis=0, out=prefix[1:])
+    return prefix[:-1] - prefix[indptr[groups]], prefix[indptr[1:]] - prefix[indptr[:-1]]
+
+def member_response(lengths: NDArray[float64],
+                    end_forces: NDArray[float64],
+                    end_displacements: NDArray[float64],
+                    rigidities: NDArray[float64],
+                    point_loads: BarsPtLoads,
+                    distributed_loads: BarsDistLoads
+                    ) -> tuple[NDArray[np.int64], NDArray[float64], NDArray[float64],
+                               NDArray[float64], NDArray[float64]]:
+    """Piecewise polynomials of the internal forces and deflections of all bars and load cases
+
+    Args:
+        lengths (NDArray[float64]): Length of the bars (nbars,)
+        end_forces (NDArray[float64]): End forces of the bars in local coordinates with the
+            signs of bar.extreme_forces (nloads, nbars, 12)
+        end_displacements (NDArray[float64]): Displacements of the ends of the bars in local
+            coordinates (nloads, nbars, 12)
+        rigidities (NDArray[float64]): EA, EIy and EIz of the bars (nbars, 3)
+        point_loads (BarsPtLoads): Point loads in local coordinates
+        distributed_loads (BarsDistLoads): Distributed loads in local coordinates
+
+    Returns:
+        tuple[NDArray[np.int64], NDArray[float64], NDArray[float64], NDArray[float64],
+            NDArray[float64]]: First segment of each group (nloads · nbars + 1,), start and end
+            of each segment (nsegments,), coefficients of the forces (nsegments, 6, 4) and of
+            the deflections (nsegments, 3, 6)
+    """
+    lengths = np.asarray(lengths, dtype=float64)
+    nloads, nbars = end_forces.shape[:2]
+    indptr, starts, ends = breakpoints(lengths, nloads, point_loads, distributed_loads)
+    groups = np.repeat(np.arange(nloads * nbars), np.diff(indptr))
+    bars = groups % max(nbars, 1)
+
+    # Forces: polynomials after the start of each segment, in powers of t
+    forces = taylor_shift(diagrams.polynomials(lengths, groups, starts, end_forces,
+                                               point_loads, distributed_loads, 'right'),
+                          starts)
+
+    # Deflections of each segment from its start: u from N / EA, v from Mz / EIz and w from
+    # My / EIy (t^0 and t^1 of v and w are added below)
+    rigidity = np.asarray(rigidities, dtype=float64)[bars]
+    deflections = np.zeros([starts.size, 3, 6])
+    deflections[:, 0, :5] = integrate(forces[:, 0] / rigidity[:, [0]])
+    deflections[:, 1] = integrate(forces[:, 5] / rigidity[:, [2]], 2)
+    deflections[:, 2] = integrate(forces[:, 4] / rigidity[:, [1]], 2)
+
+    # Continuity between the segments: y_j(t) = Y_j + S_j·t + P_j(t) with
+    #   S_j = S_0 + a_j, a_j = sum(P_i'(h_i)) for i < j (the slope of u is not continuous)
+    #   Y_j = Y_0 + S_0·x_j + b_j, b_j = sum(a_i·h_i + P_i(h_i)) for i < j
+    size = ends - starts
+    slope_end = evaluate(deflections[..., 1:] * np.arange(1, 6), size) # (nsegments, 3)
+    slope_end[:, 0] = 0
+    value_end = evaluate(deflections, size)
+
+    # Sums of the previous segments of each group (segmented prefix sums)
+    a, _ = _group_sums(slope_end, indptr, groups)
+    b, b_total = _group_sums(a * size[:, np.newaxis] + value_end, indptr, groups)
+
+    # Start of the bar: translations of the start; slopes of v and w from the end translations
+    displacements = end_displacements.reshape(nloads * nbars, 12)
+    start_value = displacements[:, :3]
+    start_slope = (displacements[:, 6:9] - start_value - b_total) / \
+        np.tile(lengths, nloads)[:, np.newaxis]
+    start_slope[:, 0] = 0
+
+    deflections[..., 0] += start_value[groups] + start_slope[groups] * starts[:, np.newaxis] + b
+    deflections[..., 1] += start_slope[groups] + a
+
+    return indptr, starts, ends, forces, deflections
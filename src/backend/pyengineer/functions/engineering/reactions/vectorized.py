@@ -0,0 +1,142 @@
+"""
+Functions to calculate reactions in bars with many point and trapezoidal loads at once.
+Each line of the arrays is one load in one component (0 to 5: Fx, Fy, Fz, Mx, My, Mz) and the
+reactions are returned in the order of the local vector of the bar:
+    Rxa, Rya, Rza, Mxa, Mya, Mza, Rxb, Ryb, Rzb, Mxb, Myb, Mzb.
+The point loads use the formulas of the module "point". The trapezoidal loads integrate the
+same formulas with the 3 points Gauss-Legendre quadrature, which is exact because the
+integrand (linear load times reaction of a point load) has degree 4 at most.
+"""
+import numpy as np
+from numpy.typing import NDArray, ArrayLike
+from numpy import float64
+
+# Components of the loads
+COMPONENTS = ('Fx', 'Fy', 'Fz', 'Mx', 'My', 'Mz')
+
+# 3 points Gauss-Legendre quadrature on [-1, 1]
+GAUSS_POINTS = np.array([-np.sqrt(3 / 5), 0.0, np.sqrt(3 / 5)])
+GAUSS_WEIGHTS = np.array([5 / 9, 8 / 9, 5 / 9])
+
+
+# Point loads /////////////////////////////////////////////////////////////////////////////////////
+def point_loads(
+        length: ArrayLike,
+        x: ArrayLike,
+        p: ArrayLike,
+        component: ArrayLike
+    ) -> NDArray[float64]:
+    """Calculates the reactions of bars with point loads.
+
+    Args:
+        length (ArrayLike): Length of the bar of each load (n,)
+        x (ArrayLike): Position of each load (n,)
+        p (ArrayLike): Intensity of each load (n,)
+        component (ArrayLike): Component of each load, 0 to 5 (Fx, Fy, Fz, Mx, My, Mz), (n,)
+
+    Raises:
+        ValueError: If a position is not in the range 0 <= x <= L
+
+    Returns:
+        NDArray[float64]: The reactions at the two ends of the bars (n, 12)
+    """
+    length, x, p = (np.ravel(np.asarray(value, dtype=float64)) for value in (length, x, p))
+    component = np.ravel(np.asarray(component, dtype=np.int64))
+
+    if not np.all((0 <= x) & (x <= length)):
+        raise ValueError("Need 0 <= x <= L.")
+
+    return _point_reactions(length, x, p, component)
+
+# Trapezoidal loads ///////////////////////////////////////////////////////////////////////////////
+def trapezoidal_loads(
+        length: ArrayLike,
+        x1: ArrayLike, x2: ArrayLike,
+        p1: ArrayLike, p2: ArrayLike,
+        component: ArrayLike
+    ) -> NDArray[float64]:
+    """Calculates the reactions of bars with trapezoidal distributed loads.
+
+    Args:
+        length (ArrayLike): Length of the bar of each load (n,)
+        x1 (ArrayLike): Start position of each load (n,)
+        x2 (ArrayLike): End position of each load (n,)
+        p1 (ArrayLike): Intensity of each load at the start position (n,)
+        p2 (ArrayLike): Intensity of each load at the end position (n,)
+        component (ArrayLike): Component of each load, 0 to 5 (Fx, Fy, Fz, Mx, My, Mz), (n,)
+
+    Raises:
+        ValueError: If the positions are not in the range 0 <= x1 < x2 <= L
+
+    Returns:
+        NDArray[float64]: The reactions at the two ends of the bars (n, 12)
+    """
+    length, x1, x2, p1, p2 = (np.ravel(np.asarray(value, dtype=float64))
+                              for value in (length, x1, x2, p1, p2))
+    component = np.ravel(np.asarray(component, dtype=np.int64))
+
+    if not np.all((0 <= x1) & (x1 < x2) & (x2 <= length)):
+        raise ValueError("Need 0 <= x1 < x2 <= L.")
+
+    # Each load is the sum of 3 point loads (position and weighted intensity of the quadrature)
+    half = (x2 - x1) / 2
+    x = (x1 + half)[:, np.newaxis] + half[:, np.newaxis] * GAUSS_POINTS
+    p = (p1[:, np.newaxis] + (p2 - p1)[:, np.newaxis] * (GAUSS_POINTS + 1) / 2) * \
+        half[:, np.newaxis] * GAUSS_WEIGHTS
+
+    reactions = _point_reactions(np.repeat(length, 3), x.ravel(), p.ravel(),
+                                 np.repeat(component, 3))
+
+    return reactions.reshape((-1, 3, 12)).sum(axis=1)
+
+# Formulas of the point loads /////////////////////////////////////////////////////////////////////
+def _point_reactions(
+        length: NDArray[float64],
+        x: NDArray[float64],
+        p: NDArray[float64],
+        component: NDArray[np.int64]
+    ) -> NDArray[float64]:
+    """Reactions of the point loads, without verifying the positions (same formulas of "point")"""
+    reactions = np.zeros([length.size, 12])
+
+    a = x
+    b = length - x
+    l = length
+
+    # Forces in x and moments in x (axial and torsion) ********************************************
+    for index, start in ((0, 0), (3, 3)):
+        line = component == index
+        reactions[line, start] = -p[line] * b[line] / l[line]
+        reactions[line, start + 6] = -p[line] * a[line] / l[line]
+
+    # Force in y **********************************************************************************
+    line = component == 1
+    pl, al, bl, ll = p[line], a[line], b[line], l[line]
+    moment_a = -(pl * al * bl**2) / ll**2
+    moment_b = (pl * al**2 * bl) / ll**2
+    reactions[line, 5] = moment_a
+    reactions[line, 11] = moment_b
+    reactions[line, 1] = -((pl * bl / ll) - (moment_a + moment_b) / ll)
+    reactions[line, 7] = -((pl * al / ll) + (moment_a + moment_b) / ll)
+
+    # Force in z **********************************************************************************
+    line = component == 2
+    pl, al, bl, ll = p[line], a[line], b[line], l[line]
+    moment_a = (pl * al * bl**2) / ll**2
+    moment_b = -(pl * al**2 * bl) / ll**2
+    reactions[line, 4] = moment_a
+    reactions[line, 10] = moment_b
+    reactions[line, 2] = -((pl * bl / ll) + (moment_a + moment_b) / ll)
+    reactions[line, 8] = -((pl * al / ll) - (moment_a + moment_b) / ll)
+
+    # Moments in y and z **************************************************************************
+    # Moment in y: (Mya, Myb) and (Rza, Rzb); moment in z: (Mza, Mzb) and (Rya, Ryb)
+    for index, moment, force, sign in ((4, 4, 2, -1), (5, 5, 1, 1)):
+        line = component == index
+        pl, al, bl, ll = p[line], a[line], b[line], l[line]
+        reactions[line, moment] = ((pl * bl) / ll**2) * (2*al - bl)
+        reactions[line, moment + 6] = ((pl * al) / ll**2) * (2*bl - al)
+        reactions[line, force] = sign * (6 * pl * al * bl) / ll**3
+        reactions[line, force + 6] = -sign * (6 * pl * al * bl) / ll**3
+
+    return reactions
@@ -0,0 +1,152 @@
+"""Rotation (direction cosines) of the bars calculated for all bars at once"""
+import numpy as np
+from numpy import float64
+from numpy.typing import NDArray, ArrayLike
+
+
+def _norm(dx: NDArray[float64], dy: NDArray[float64], dz: NDArray[float64]) -> NDArray[float64]:
+    """sqrt(dx**2 + dy**2 + dz**2) rounded as the same expression on scalars
+
+    The power of scalars uses the C pow, while "array**2" is a multiplication that sometimes
+    differs in the last bit. float_power also uses the C pow.
+    """
+    return np.sqrt(np.float_power(dx, 2) + np.float_power(dy, 2) + np.float_power(dz, 2))
+
+
+def direction_cosines(start: ArrayLike,
+                      end: ArrayLike,
+                      rotation: ArrayLike,
+                      y_up: ArrayLike = False) -> NDArray[float64]:
+    """Direction cosines (3x3 rotation from global to local axes) of the bars
+
+    Same operations of Bar.calculate_r, so the result is bit-compatible with the bar by bar
+    calculation. The 12x12 rotation of a bar has four copies of this matrix on the diagonal.
+
+    Args:
+        start (ArrayLike): (x, y, z) of the start nodes (nbars, 3)
+        end (ArrayLike): (x, y, z) of the end nodes (nbars, 3)
+        rotation (ArrayLike): Rotation in degrees around the bar axis (nbars,)
+        y_up (ArrayLike, optional): Uses "y" as the up axis (nbars,). Defaults to False.
+
+    Returns:
+        NDArray[float64]: Direction cosines (nbars, 3, 3). Lines are the local axes x, y and z.
+    """
+    start = np.asarray(start, dtype=float64).reshape(-1, 3)
+    end = np.asarray(end, dtype=float64).reshape(-1, 3)
+    nbars = start.shape[0]
+    rotation = np.broadcast_to(np.asarray(rotation, dtype=float64), (nbars,))
+    y_up = np.broadcast_to(np.asarray(y_up, dtype=bool), (nbars,))
+
+    dx = end[:, 0] - start[:, 0]
+    dy = end[:, 1] - start[:, 1]
+    dz = end[:, 2] - start[:, 2]
+    length = _norm(dx, dy, dz)
+
+    rot_aux = np.zeros([nbars, 3, 3])
+    rot_aux[:, 0, 0] = dx / length
+    rot_aux[:, 0, 1] = dy / length
+    rot_aux[:, 0, 2] = dz / length
+
+    # Assistant point for determinate xy to bar /////////////////////////////////////////////////
+    # Initial Assistant point ********************************************************************
+    aux = end.copy()
+    horizontal_y_up = y_up & ((dx != 0) | (dz != 0))
+    vertical_y_up = y_up & ~horizontal_y_up
+    not_vertical = ~y_up & ((dx != 0) | (dy != 0))
+    vertical_up = ~y_up & ~not_vertical & (dz > 0)
+    vertical_down = ~y_up & ~not_vertical & ~(dz > 0)
+    aux[horizontal_y_up, 1] += 1
+    aux[vertical_y_up, 0] += 1
+    aux[not_vertical, 2] += 1
+    aux[vertical_up, 0] -= 1
+    aux[vertical_down, 0] += 1
+
+    # Rotate assistant point around x axis (Rodrigues) *******************************************
+    axis_up = np.where(y_up, 0, -90)  # sum -90 deg for z up
+    angle = np.deg2rad(rotation + axis_up)
+
+    u = end - start
+    u = u / np.sqrt(np.vecdot(u, u))[:, np.newaxis] # Same reduction of np.linalg.norm
+    p_relative = aux - start
+    cos_theta = np.cos(angle)[:, np.newaxis]
+    sin_theta = np.sin(angle)[:, np.newaxis]
+    cross = np.cross(u, p_relative)
+    dot = np.vecdot(u, p_relative)[:, np.newaxis]
+    aux = (p_relative * cos_theta + cross * sin_theta + u * dot * (1 - cos_theta)) + start
+    # ///////////////////////////////////////////////////////////////////////////////////////////
+
+    dx = aux[:, 0] - end[:, 0]
+    dy = aux[:, 1] - end[:, 1]
+    dz = aux[:, 2] - end[:, 2]
+    c = _norm(dx, dy, dz)
+
+    alpha = dx / c
+    beta = dy / c
+    gamma = dz / c
+
+    dx = rot_aux[:, 0, 1] * gamma - rot_aux[:, 0, 2] * beta
+    dy = rot_aux[:, 0, 2] * alpha - rot_aux[:, 0, 0] * gamma
+    dz = rot_aux[:, 0, 0] * beta - rot_aux[:, 0, 1] * alpha
+    c = _norm(dx, dy, dz)
+
+    rot_aux[:, 2, 0] = dx / c
+    rot_aux[:, 2, 1] = dy / c
+    rot_aux[:, 2, 2] = dz / c
+
+    rot_aux[:, 1, 0] = rot_aux[:, 0, 2] * rot_aux[:, 2, 1] - rot_aux[:, 0, 1] * rot_aux[:, 2, 2]
+    rot_aux[:, 1, 1] = rot_aux[:, 0, 0] * rot_aux[:, 2, 2] - rot_aux[:, 0, 2] * rot_aux[:, 2, 0]
+    rot_aux[:, 1, 2] = rot_aux[:, 0, 1] * rot_aux[:, 2, 0] - rot_aux[:, 0, 0] * rot_aux[:, 2, 1]
+
+    return rot_aux
+
+
+def to_local(vectors: NDArray[float64], r3: NDArray[float64]) -> NDArray[float64]:
+    """Transform vectors of the bars from global to local axes (r @ vector with the 12x12 r)
+
+    Args:
+        vectors (NDArray[float64]): Vectors with a multiple of 3 components (..., nbars, 3k) or
+            (3k,) for one bar
+        r3 (NDArray[float64]): Direction cosines of the bars (nbars, 3, 3) or (3, 3) for one bar
+
+    Returns:
+        NDArray[float64]: Vectors in local axes, same shape of the vectors
+    """
+    blocks = np.reshape(vectors, (*np.shape(vectors)[:-1], np.shape(vectors)[-1] // 3, 3))
+    return (blocks @ np.swapaxes(r3, -1, -2)).reshape(np.shape(vectors))
+
+
+def to_global(vectors: NDArray[float64], r3: NDArray[float64]) -> NDArray[float64]:
+    """Transform vectors of the bars from local to global axes (r.T @ vector with the 12x12 r)
+
+    Args:
+        vectors (NDArray[float64]): Vectors with a multiple of 3 components (..., nbars, 3k) or
+            (3k,) for one bar
+        r3 (NDArray[float64]): Direction cosines of the bars (nbars, 3, 3) or (3, 3) for one bar
+
+    Returns:
+        NDArray[float64]: Vectors in global axes, same shape of the vectors
+    """
+    blocks = np.reshape(vectors, (*np.shape(vectors)[:-1], np.shape(vectors)[-1] // 3, 3))
+    return (blocks @ r3).reshape(np.shape(vectors))
+
+
+def to_global_matrix(matrices: NDArray[float64], r3: NDArray[float64]) -> NDArray[float64]:
+    """Transform matrices of the bars from local to global axes (r.T @ matrix @ r)
+
+    The matriz of rotation has four r3 blocks on the diagonal, so the matrix is multiplied by
+    r3 in blocks of 3 columns (about 4 times less operations than with the 12x12 matrices).
+
+    Args:
+        matrices (NDArray[float64]): Matrices of the bars (nbars, 12, 12)
+        r3 (NDArray[float64]): Direction cosines of the bars (nbars, 3, 3)
+
+    Returns:
+        NDArray[float64]: Matrices in global axes (nbars, 12, 12)
+    """
+    nbars = matrices.shape[0]
+    # matrix @ r: each line of a 3 columns block times r3
+    right = (matrices.reshape(nbars, 48, 3) @ r3).reshape(nbars, 12, 12)
+    # r.T @ (matrix @ r) = ((matrix @ r).T @ r).T
+    left = (right.transpose(0, 2, 1).reshape(nbars, 48, 3) @ r3).reshape(nbars, 12, 12)
+
+    return np.ascontiguousarray(left.transpose(0, 2, 1))
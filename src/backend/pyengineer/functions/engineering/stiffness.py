@@ -0,0 +1,192 @@
+"""Stiffness of the bars calculated for all bars at once"""
+import numpy as np
+from numpy import float64
+from numpy.typing import NDArray, ArrayLike
+
+
+def local_stiffness(length: ArrayLike,
+                    area: ArrayLike,
+                    ix: ArrayLike, iy: ArrayLike, iz: ArrayLike,
+                    e: ArrayLike, g: ArrayLike) -> NDArray[float64]:
+    """Local stiffness matrices (without releases) of 3D frame bars
+
+    Args:
+        length (ArrayLike): Length of the bars (nbars,)
+        area (ArrayLike): Area of the sections (nbars,)
+        ix (ArrayLike): Inertia in 'x' of the sections (polar inertia) (nbars,)
+        iy (ArrayLike): Inertia in 'y' of the sections (nbars,)
+        iz (ArrayLike): Inertia in 'z' of the sections (nbars,)
+        e (ArrayLike): Elastic modulus of the materials (nbars,)
+        g (ArrayLike): Transverse elastic modulus of the materials (nbars,)
+
+    Returns:
+        NDArray[float64]: Local stiffness matrices (nbars, 12, 12)
+    """
+    l, a, ix, iy, iz, e, g = np.broadcast_arrays(*(np.atleast_1d(np.asarray(value, dtype=float64))
+                                                   for value in (length, area,
+                                                                 ix, iy, iz, e, g)))
+
+    kl = np.zeros([l.shape[0], 12, 12])
+
+    axial = (e * a) / l
+    shear_y = (12 * e * iz) / l**3
+    shear_moment_z = (6 * e * iz) / l**2
+    shear_z = (12 * e * iy) / l**3
+    shear_moment_y = (-6 * e * iy) / l**2
+    torsion = (g * ix) / l
+    moment_y = (4 * e * iy) / l
+    moment_y_far = (2 * e * iy) / l
+    moment_z = (4 * e * iz) / l
+    moment_z_far = (2 * e * iz) / l
+
+    # Upper triangle (line, column, value); the lower triangle is the symmetric
+    terms = ((0, 0, axial), (0, 6, -axial),
+             (1, 1, shear_y), (1, 5, shear_moment_z), (1, 7, -shear_y), (1, 11, shear_moment_z),
+             (2, 2, shear_z), (2, 4, shear_moment_y), (2, 8, -shear_z), (2, 10, shear_moment_y),
+             (3, 3, torsion), (3, 9, -torsion),
+             (4, 4, moment_y), (4, 8, -shear_moment_y), (4, 10, moment_y_far),
+             (5, 5, moment_z), (5, 7, -shear_moment_z), (5, 11, moment_z_far),
+             (6, 6, axial),
+             (7, 7, shear_y), (7, 11, -shear_moment_z),
+             (8, 8, shear_z), (8, 10, -shear_moment_y),
+             (9, 9, torsion),
+             (10, 10, moment_y),
+             (11, 11, moment_z))
+
+    for line, column, value in terms:
+        kl[:, line, column] = value
+        kl[:, column, line] = value
+
+    return kl
+
+
+def condensation(kl_nr: NDArray[float64],
+                 releases: NDArray[np.bool_],
+                 tol: float = 1e-12) -> NDArray[float64]:
+    """Static condensation operators of the releases (Schur complement)
+
+    For the maintained (k) and released (r) DOFs, the operator T has T_kk = I,
+    T_kr = -K_kr·K_rr⁻¹ and zero lines in the released DOFs, so the condensed stiffness is T·K
+    and the condensed loads vector is T·f. Bars with the same release mask are calculated
+    together; ill-conditioned K_rr (cond ≥ 1/tol) use the pseudo-inverse.
+
+    Args:
+        kl_nr (NDArray[float64]): Local stiffness matrices without releases (nbars, 12, 12)
+        releases (NDArray[np.bool_]): Released DOFs of the bars (nbars, 12)
+        tol (float, optional): Tolerance for singularity check. Defaults to 1e-12.
+
+    Returns:
+        NDArray[float64]: Condensation operators (nbars, 12, 12), identity for bars without
+            releases
+    """
+    releases = np.asarray(releases, dtype=bool).reshape(-1, 12)
+    operators = np.zeros([releases.shape[0], 12, 12])
+    operators[:, np.arange(12), np.arange(12)] = 1.0
+
+    masks, inverse = np.unique(releases, axis=0, return_inverse=True)
+    for mask_index, mask in enumerate(masks):
+        if not mask.any():
+            continue
+
+        bars = np.flatnonzero(inverse.ravel() == mask_index)
+        r_idx = np.flatnonzero(mask)
+        k_idx = np.flatnonzero(~mask)
+
+        k_kr = kl_nr[np.ix_(bars, k_idx, r_idx)]
+        k_rr = kl_nr[np.ix_(bars, r_idx, r_idx)]
+
+        krr_inv = _inverse(k_rr, tol)
+
+        operators[np.ix_(bars, k_idx, r_idx)] = -(k_kr @ krr_inv)
+        operators[np.ix_(bars, r_idx, r_idx)] = 0.0
+
+    return operators
+
+
+def condense(kl_nr: NDArray[float64],
+             operators: NDArray[float64],
+             releases: NDArray[np.bool_]) -> NDArray[float64]:
+    """Local stiffness matrices with releases (T·K with zero lines and columns released)
+
+    Args:
+        kl_nr (NDArray[float64]): Local stiffness matrices without releases (nbars, 12, 12)
+        operators (NDArray[float64]): Condensation operators (nbars, 12, 12)
+        releases (NDArray[np.bool_]): Released DOFs of the bars (nbars, 12)
+
+    Returns:
+        NDArray[float64]: Local stiffness matrices with releases (nbars, 12, 12)
+    """
+    releases = np.asarray(releases, dtype=bool).reshape(-1, 12)
+    kl = kl_nr.copy()
+
+    released_bars = np.flatnonzero(releases.any(axis=1))
+    if released_bars.size:
+        condensed = operators[released_bars] @ kl_nr[released_bars]
+        condensed[np.broadcast_to(releases[released_bars, np.newaxis, :],
+                                  condensed.shape)] = 0.0 # Exact zero columns
+        kl[released_bars] = condensed
+
+    return kl
+
+
+def released_displacements(kl_nr: NDArray[float64],
+                           releases: NDArray[np.bool_],
+                           end_displacements: NDArray[float64],
+                           loads_vectors: NDArray[float64],
+                           tol: float = 1e-12) -> NDArray[float64]:
+    """Displacements of the ends of the bars with the released DOFs recovered
+
+    The released DOFs of a bar follow the nodes, not the bar (hinges), and are recovered from
+    the null end forces: u_r = K_rr⁻¹·(p_r - K_rk·u_k), with the equivalent nodal loads p
+    without condensation. Bars with the same release mask are calculated together; ill-conditioned
+    K_rr (cond ≥ 1/tol) use the pseudo-inverse.
+
+    Args:
+        kl_nr (NDArray[float64]): Local stiffness matrices without releases (nbars, 12, 12)
+        releases (NDArray[np.bool_]): Released DOFs of the bars (nbars, 12)
+        end_displacements (NDArray[float64]): Displacements of the nodes of the bars in local
+            coordinates (nloads, nbars, 12)
+        loads_vectors (NDArray[float64]): Equivalent nodal loads of the bars in local
+            coordinates, without condensation (nloads, nbars, 12)
+        tol (float, optional): Tolerance for singularity check. Defaults to 1e-12.
+
+    Returns:
+        NDArray[float64]: Displacements of the ends of the bars in local coordinates
+            (nloads, nbars, 12)
+    """
+    releases = np.asarray(releases, dtype=bool).reshape(-1, 12)
+    displacements = np.array(end_displacements, dtype=float64)
+
+    masks, inverse = np.unique(releases, axis=0, return_inverse=True)
+    for mask_index, mask in enumerate(masks):
+        if not mask.any():
+            continue
+
+        bars = np.flatnonzero(inverse.ravel() == mask_index)
+        r_idx = np.flatnonzero(mask)
+        k_idx = np.flatnonzero(~mask)
+
+        k_rk = kl_nr[np.ix_(bars, r_idx, k_idx)]
+        krr_inv = _inverse(kl_nr[np.ix_(bars, r_idx, r_idx)], tol)
+
+        maintained = displacements[:, bars][..., k_idx]
+        forces = loads_vectors[:, bars][..., r_idx] - (k_rk @ maintained[..., np.newaxis])[..., 0]
+        displacements[np.ix_(np.arange(displacements.shape[0]), bars, r_idx)] = \
+            (krr_inv @ forces[..., np.newaxis])[..., 0]
+
+    return displacements
+
+
+def _inverse(matrices: NDArray[float64], tol: float) -> NDArray[float64]:
+    """Inverses of the matrices, pseudo-inverses of the ill-conditioned (cond ≥ 1/tol)"""
+    inverses = np.empty_like(matrices)
+    regular = np.linalg.cond(matrices) < 1.0 / tol # nan (singular) is not regular
+    if regular.any():
+        try:
+            inverses[regular] = np.linalg.inv(matrices[regular])
+        except np.linalg.LinAlgError:
+            regular[:] = False
+    if not regular.all():
+        inverses[~regular] = np.linalg.pinv(matrices[~regular])
+
+    return inverses
@@ -1,9 +1,10 @@
 """Exportação"""
 from ._bar import Bar
+from ._combination import Combination
 from ._load import Load
 from ._material import Material
 from ._node import Node
 from ._section import Section
 from ._support import Support
 
-__all__ = ['Bar', 'Load', 'Material', 'Node', 'Section', 'Support']
+__all__ = ['Bar', 'Combination', 'Load', 'Material', 'Node', 'Section', 'Support']
@@ -11,11 +11,10 @@ from ._material import Material
 from ._node import Node
 from ._section import Section
 
-from ..functions import space_3d
-from ..functions.engineering.reactions import point as pt
-from ..functions.engineering.reactions import section as sc
+from ..functions.engineering import rotation as rotation_functions, stiffness
+from ..functions.engineering.reactions import vectorized
 
-from ..types import ReleasesType
+from ..types import BarsDistLoads, BarsPtLoads, ReleasesType
 
 if TYPE_CHECKING:
     from ._load import Load
@@ -37,11 +36,11 @@ class Bar:
     releases: dict[ReleasesType, bool] # Releases at the ends of the bar
     kl: NDArray[float64] # Matriz of local stiffness with releases
     kl_nr: NDArray[float64] # Matriz of local stiffness without releases
-    r: NDArray[float64] # Matriz of rotation
+    condensation: NDArray[float64] # Static condensation operator of the releases
+    r3: NDArray[float64] # Direction cosines (3x3 block of the matriz of rotation)
     klg: NDArray[float64] # Matriz of global stiffness
     y_up: bool # Modify default up for compare with PyNite
     extreme_forces: dict[str, NDArray[float64]]
-    vector_loads: NDArray[float64] # Vector of all loads in global coordinates
 
     def __init__(self,
                  name: str,
@@ -80,277 +79,143 @@ class Bar:
         }
         self.kl =  np.zeros([12, 12])
         self.kl_nr = np.zeros([12, 12])
-        self.r =  np.zeros([12, 12])
+        self.condensation = np.eye(12)
+        self.r3 = np.zeros([3, 3])
         self.klg = np.zeros([12, 12])
         self.y_up = False
         self.extreme_forces = {}
-        self.vector_loads = np.zeros(12)
 
-    def calculate_klg(self) -> NDArray[float64]:
+    def calculate_klg(self, klg: NDArray[float64] | None = None) -> NDArray[float64]:
         """Transforma a matriz de rigidez local em global
 
         Args:
-            bar (Bar): Barra
+            klg (NDArray[float64] | None, optional): Matriz de rigidez global já calculada (por
+                exemplo, uma vista da pilha calculada para todas as barras). None calcula a
+                matriz da barra. Defaults to None.
 
         Returns:
             ndarray: Matriz de rigidez global
         """
-        r = self.r.copy()
-        klg = self.r.T @ self.kl @ r
+        if klg is None:
+            klg = rotation_functions.to_global_matrix(self.kl[np.newaxis], self.r3[np.newaxis])[0]
 
         self.klg = klg # Atribui ao objeto
 
         return klg
 
+    @property
+    def release_mask(self) -> NDArray[np.bool_]:
+        """Released DOFs in the order of the local DOFs (Dxi, ..., Rzj)
 
-    def calculate_kl(self) -> NDArray[float64]:
+        Returns:
+            NDArray[np.bool_]: Mask of the released DOFs (12,)
+        """
+        return np.array([
+                self.releases['Dxi'], self.releases['Dyi'], self.releases['Dzi'],
+                self.releases['Rxi'], self.releases['Ryi'], self.releases['Rzi'],
+                self.releases['Dxj'], self.releases['Dyj'], self.releases['Dzj'],
+                self.releases['Rxj'], self.releases['Ryj'], self.releases['Rzj']
+                ], dtype=bool)
+
+    def calculate_kl(self,
+                     kl_nr: NDArray[float64] | None = None,
+                     condensation: NDArray[float64] | None = None,
+                     kl: NDArray[float64] | None = None) -> NDArray[float64]:
         """Calcula a matriz de rigidez local da barra
 
+        As liberações são aplicadas por condensação estática (complemento de Schur). O operador
+        de condensação fica guardado na barra e também é usado nos vetores de cargas.
+
         Args:
-            bar (Bar): Barra
+            kl_nr (NDArray[float64] | None, optional): Matriz de rigidez local sem liberações já
+                calculada (por exemplo, uma vista da pilha calculada para todas as barras).
+                None calcula a matriz da barra. Defaults to None.
+            condensation (NDArray[float64] | None, optional): Operador de condensação já
+                calculado. None calcula o operador da barra. Defaults to None.
+            kl (NDArray[float64] | None, optional): Matriz de rigidez local com liberações já
+                calculada. None calcula a matriz da barra. Defaults to None.
 
         Returns:
             ndarray: matriz de rigidez local
         """
-        kl = np.zeros([12, 12])
-
-        l = self.length
-        a = self.section.properties['area']
-        ix = self.section.properties['Ix']
-        iy = self.section.properties['Iy']
-        iz = self.section.properties['Iz']
-        e = self.material.properties['E']
-        g = self.material.properties['G']
-
-        kl[0][0] = (e * a) / l
-        kl[0][6] = -kl[0][0]
-        kl[1][1] = (12 * e * iz) / l**3
-        kl[1][5] = (6 * e * iz) / l**2
-        kl[1][7] = -kl[1][1]
-        kl[1][11] = kl[1][5]
-        kl[2][2] = (12 * e * iy) / l**3
-        kl[2][4] = (-6 * e * iy) / l**2
-        kl[2][8] = -kl[2][2]
-        kl[2][10] = kl[2][4]
-        kl[3][3] = (g * ix) / l
-        kl[3][9] = -kl[3][3]
-        kl[4][4] = (4 * e * iy) / l
-        kl[4][8] = -kl[2][4]
-        kl[4][10] = (2 * e * iy) / l
-        kl[5][5] = (4 * e * iz) / l
-        kl[5][7] = -kl[1][5]
-        kl[5][11] = (2 * e * iz) / l
-        kl[6][6] = kl[0][0]
-        kl[7][7] = kl[1][1]
-        kl[7][11] = -kl[1][5]
-        kl[8][8] = kl[2][2]
-        kl[8][10] = -kl[2][4]
-        kl[9][9] = kl[3][3]
-        kl[10][10] = kl[4][4]
-        kl[11][11] = kl[5][5]
-        kl = kl + kl.T - np.diag(kl.diagonal())
-
-        self.kl_nr = kl.copy() # Stores the matrix without considering releases
-
-        # Apply releases //////////////////////////////////////////////////////////////////////////
-        kl_releases = np.zeros([12, 12])
-        releases_calculates: list[int] = []
-        for index, value in enumerate(self.releases.values()):
-            if value:
-                l = index
-            else:
-                continue
+        if kl_nr is None:
+            kl_nr = stiffness.local_stiffness(self.length,
+                                              self.section.properties['area'],
+                                              self.section.properties['Ix'],
+                                              self.section.properties['Iy'],
+                                              self.section.properties['Iz'],
+                                              self.material.properties['E'],
+                                              self.material.properties['G'])[0]
+        release_mask = self.release_mask[np.newaxis]
+        if condensation is None:
+            condensation = stiffness.condensation(kl_nr[np.newaxis], release_mask)[0]
+        if kl is None:
+            kl = stiffness.condense(kl_nr[np.newaxis], condensation[np.newaxis], release_mask)[0]
+
+        self.kl_nr = kl_nr # Stores the matrix without considering releases
+        self.condensation = condensation
+        self.kl = kl # Atribui ao objeto
 
-            for j in range(12):
-                if j in releases_calculates:
-                    continue
+        return kl
 
-                kl_bar = kl[j, l] / kl[l, l]
-                for k in range(12):
-                    if k in releases_calculates:
-                        continue
-                    kl_releases[j, k] = kl[j, k] - kl_bar * kl[l, k]
+    @property
+    def r(self) -> NDArray[float64]:
+        """Matriz of rotation (12x12) built from the direction cosines
 
-            kl = kl_releases.copy()
-            releases_calculates.append(l)
+        Returns:
+            NDArray[float64]: Matriz of rotation
+        """
+        rotation_matrix = np.zeros([12, 12])
+        for block in range(0, 12, 3):
+            rotation_matrix[block:block + 3, block:block + 3] = self.r3
 
-        # /////////////////////////////////////////////////////////////////////////////////////////
+        return rotation_matrix
 
-        self.kl = kl # Atribui ao objeto
+    def calculate_r(self, r3: NDArray[float64] | None = None) -> NDArray[float64]:
+        """Calcula os cossenos diretores (bloco 3x3 da matriz de rotação) da barra
 
-        return kl
+        Args:
+            r3 (NDArray[float64] | None, optional): Cossenos diretores já calculados (por exemplo,
+                uma vista da pilha calculada para todas as barras). None calcula os da barra.
+                Defaults to None.
+
+        Returns:
+            ndarray: Cossenos diretores (3x3)
+        """
+        if r3 is None:
+            r3 = rotation_functions.direction_cosines(self.start_node.position,
+                                                      self.end_node.position,
+                                                      self.rotation,
+                                                      self.y_up)[0]
+
+        self.r3 = r3 # Atribui os cossenos diretores no objeto barra
 
-    def calculate_r(self):
-        """Calcula a matriz de rotação da barra
+        return r3
+
+    def calculate_forces_vector(self, load: Load) -> NDArray[float64]:
+        """Calculate the vector of forces in global coordinates considering releases
 
         Args:
-            bar (Bar): Barra
+            load (Load): Load
 
         Returns:
-            ndarray: Matriz de rotação
+            NDArray[float64]: Equivalent nodal loads of the load case in global coordinates
         """
-        x1 = self.end_node.x
-        y1 = self.end_node.y
-        z1 = self.end_node.z
-
-        dx = self.dx
-        dy = self.dy
-        dz = self.dz
-
-        rot_aux = np.zeros([3, 3])
-        rot_aux[0, 0] = dx / self.length
-        rot_aux[0, 1] = dy / self.length
-        rot_aux[0, 2] = dz / self.length
-
-        # Assistant point for determinate xy to bar ////////////////////////////////////////////////
-        # Initial Assistant point ******************************************************************
-        if self.y_up:
-            if dx != 0 or dz != 0:
-                aux = np.array([x1, y1 + 1, z1])
-            else:
-                aux = np.array([x1 + 1, y1, z1])
-        else:
-            if dx != 0 or dy != 0: # If not vertical
-                aux = np.array([x1, y1, z1 + 1])
-            else:
-                if dz > 0: # vertical up
-                    aux = np.array([x1 - 1, y1, z1])
-                else: # vertical down
-                    aux = np.array([x1 + 1, y1, z1])
-
-        # Rotate assistant point around x axis ****************************************************
-        axis_up = 0 if self.y_up else -90  # sum -90 deg for z up
-        rotation = np.deg2rad(self.rotation + axis_up)
-        aux = space_3d.rotate_point_around_line(aux,
-                                                self.start_node.position,
-                                                self.end_node.position,
-                                                rotation)
-        # /////////////////////////////////////////////////////////////////////////////////////////
-
-        dx = aux[0] - x1
-        dy = aux[1] - y1
-        dz = aux[2] - z1
-        c = np.sqrt(dx**2 + dy**2 + dz**2)
-
-        alpha = dx / c
-        beta = dy / c
-        gamma = dz / c
-
-        dx = rot_aux[0, 1] * gamma - rot_aux[0, 2] * beta
-        dy = rot_aux[0, 2] * alpha - rot_aux[0, 0] * gamma
-        dz = rot_aux[0, 0] * beta - rot_aux[0, 1] * alpha
-        c = np.sqrt(dx**2 + dy**2 + dz**2)
-
-        rot_aux[2, 0] = dx / c
-        rot_aux[2, 1] = dy / c
-        rot_aux[2, 2] = dz / c
-
-        rot_aux[1, 0] = rot_aux[0, 2] * rot_aux[2, 1] - rot_aux[0, 1] * rot_aux[2, 2]
-        rot_aux[1, 1] = rot_aux[0, 0] * rot_aux[2, 2] - rot_aux[0, 2] * rot_aux[2, 0]
-        rot_aux[1, 2] = rot_aux[0, 1] * rot_aux[2, 0] - rot_aux[0, 0] * rot_aux[2, 1]
-
-        rotation = np.zeros([12, 12])
-
-        rotation[0:3, 0:3] = rot_aux
-        rotation[3:6, 3:6] = rot_aux
-        rotation[6:9, 6:9] = rot_aux
-        rotation[9:12, 9:12] = rot_aux
-
-        self.r = rotation # Atribui matriz de rotação no objeto barra
-
-        return rotation
-
-    def calculate_forces_vector(self, load: Load):
-        """Calculate the vector of forces in global coordinates considering releases
+        # Apply releases to the loads vector before transforming to global coordinates
+        return rotation_functions.to_global(
+            self.apply_loads_releases(self.kl_nr, self.calculate_loads_vector(load)), self.r3)
+
+    def calculate_loads_vector(self, load: Load) -> NDArray[float64]:
+        """Calculate the vector of equivalent nodal loads in local coordinates without releases
 
         Args:
             load (Load): Load
+
+        Returns:
+            NDArray[float64]: Sum of the equivalent nodal loads (minus the fixed-end forces) of
+                the point and distributed loads of the load case in the bar
         """
-        if self in load.bars_loads_pt:
-            # Point loads in bars /////////////////////////////////////////////////////////////////
-            for value in load.bars_loads_pt.get(self, {}).values():
-                system = value['system']
-                fx = value['Fx']
-                fy = value['Fy']
-                fz = value['Fz']
-                mx = value['Mx']
-                my = value['My']
-                mz = value['Mz']
-
-                if system == 'global':
-                    fx, fy, fz, mx, my, mz = self.r[0:6, 0:6] @ np.array([fx, fy, fz, mx, my, mz])
-
-                x = value['position']
-                l = self.length
-
-                loads_vector = np.zeros(12)
-                fxr = pt.force_x(l, x, fx) # Reactions due to the force on x
-                fyr = pt.force_y(l, x, fy) # Reactions due to the force on y
-                fzr = pt.force_z(l, x, fz) # Reactions due to the force on z
-                mxr = pt.moment_x(l, x, mx) # Reactions because of the moment on x
-                myr = pt.moment_y(l, x, my) # Reactions because of the moment on y
-                mzr = pt.moment_z(l, x, mz) # Reactions because of the moment on z
-
-                loads_vector[0] -= fxr['Rxa'] # Force in x initial
-                loads_vector[6] -= fxr['Rxb'] # Force in x final
-                loads_vector[1] -= fyr['Rya'] + mzr['Rya'] # Force in y initial
-                loads_vector[7] -= fyr['Ryb'] + mzr['Ryb'] # Force in y final
-                loads_vector[2] -= fzr['Rza'] + myr['Rza'] # Force in z initial
-                loads_vector[8] -= fzr['Rzb'] + myr['Rzb'] # Force in z final
-                loads_vector[3] -= mxr['Mxa'] # Moment in x initial
-                loads_vector[9] -= mxr['Mxb'] # Moment in x final
-                loads_vector[4] -= fzr['Mya'] + myr['Mya'] # Moment in y initial
-                loads_vector[10] -= fzr['Myb'] + myr['Myb'] # Moment in y final
-                loads_vector[5] -= fyr['Mza'] + mzr['Mza'] # Moment in z initial
-                loads_vector[11] -= fyr['Mzb'] + mzr['Mzb'] # Moment in z final
-
-                # Apply releases to the loads vector before transforming to global coordinates
-                self.vector_loads += self.r.T @ self.apply_loads_releases(self.kl_nr, loads_vector)
-
-        # Distributed loads in bars ///////////////////////////////////////////////////////////////
-        for value in load.bars_loads_dist.get(self, {}).values():
-            system = value['system']
-            fx1, fx2 = value['Fx']
-            fy1, fy2 = value['Fy']
-            fz1, fz2 = value['Fz']
-            mx1, mx2 = value['Mx']
-            my1, my2 = value['My']
-            mz1, mz2 = value['Mz']
-
-            if system == 'global':
-                fx1, fy1, fz1, mx1, my1, mz1 = self.r[0:6, 0:6] @ np.array([fx1, fy1, fz1,
-                                                                            mx1, my1, mz1])
-                fx2, fy2, fz2, mx2, my2, mz2 = self.r[0:6, 0:6] @ np.array([fx2, fy2, fz2,
-                                                                            mx2, my2, mz2])
-
-            x1 = value['x1']
-            x2 = value['x2']
-            l = self.length
-
-            loads_vector = np.zeros(12)
-
-            fxr = sc.force_x_trap(l, x1, x2, fx1, fx2) # Reactions due to the force on x
-            fyr = sc.force_y_trap(l, x1, x2, fy1, fy2) # Reactions due to the force on y
-            fzr = sc.force_z_trap(l, x1, x2, fz1, fz2) # Reactions due to the force on z
-            mxr = sc.moment_x_trap(l, x1, x2, mx1, mx2) # Reactions due to the moment on x
-            myr = sc.moment_y_trap(l, x1, x2, my1, my2) # Reactions due to the moment on y
-            mzr = sc.moment_z_trap(l, x1, x2, mz1, mz2) # Reactions due to the moment on z
-
-            loads_vector[0] -= fxr['Rxa'] # Force in x initial
-            loads_vector[6] -= fxr['Rxb'] # Force in x final
-            loads_vector[1] -= fyr['Rya'] + mzr['Rya'] # Force in y initial
-            loads_vector[7] -= fyr['Ryb'] + mzr['Ryb'] # Force in y final
-            loads_vector[2] -= fzr['Rza'] + myr['Rza'] # Force in z initial
-            loads_vector[8] -= fzr['Rzb'] + myr['Rzb'] # Force in z final
-            loads_vector[3] -= mxr['Mxa'] # Moment in x initial
-            loads_vector[9] -= mxr['Mxb'] # Moment in x final
-            loads_vector[4] -= fzr['Mya'] + myr['Mya'] # Moment in y initial
-            loads_vector[10] -= fzr['Myb'] + myr['Myb'] # Moment in y final
-            loads_vector[5] -= fyr['Mza'] + mzr['Mza'] # Moment in z initial
-            loads_vector[11] -= fyr['Mzb'] + mzr['Mzb'] # Moment in z final
-
-            # Apply releases to the loads vector before transforming to global coordinates
-            self.vector_loads += self.r.T @ self.apply_loads_releases(self.kl_nr, loads_vector)
+        return bars_loads_vectors([self], [load], self.r3[np.newaxis])[0, 0]
 
     def apply_loads_releases(self,
                              kl_nr: NDArray[float64],
@@ -367,47 +232,118 @@ class Bar:
             NDArray[float64]: Condensed loads vector with released DOFs zeroed and loads
                 redistributed to maintained DOFs.
         """
-        release_mask = np.array([
-                self.releases['Dxi'], self.releases['Dyi'], self.releases['Dzi'],
-                self.releases['Rxi'], self.releases['Ryi'], self.releases['Rzi'],
-                self.releases['Dxj'], self.releases['Dyj'], self.releases['Dzj'],
-                self.releases['Rxj'], self.releases['Ryj'], self.releases['Rzj']
-                ], dtype=bool)
-        # Index of maintained and released DOFs
-        r_idx = np.where(release_mask)[0]
-        k_idx = np.where(~release_mask)[0]
+        release_mask = self.release_mask
 
         # If no releases, return as is
-        if r_idx.size == 0:
+        if not release_mask.any():
             return loads_vector.copy()
 
-        # Partitions K and f
-        # k_kk = kl_no_releases[np.ix_(k_idx, k_idx)]
-        k_kr = kl_nr[np.ix_(k_idx, r_idx)]
-        k_rr = kl_nr[np.ix_(r_idx, r_idx)]
-
-        f_k = loads_vector[k_idx]
-        f_r = loads_vector[r_idx]
-
-        # Try resolving K_rr x = f_r; if singular, use pseudo-inverse
-        try:
-            # Check simple determinant/conditioning
-            if np.linalg.cond(k_rr) < 1.0 / tol:
-                krr_inv = np.linalg.inv(k_rr)
-            else:
-                krr_inv = np.linalg.pinv(k_rr)
-        except np.linalg.LinAlgError:
-            krr_inv = np.linalg.pinv(k_rr)
-
-        # Calculate the redistributed contribution
-        add_on_k = k_kr @ (krr_inv @ f_r)
-
-        # f_condensed for DOFs maintained:
-        f_k_cond = f_k - add_on_k
-
-        # Construct resulting vector (released = 0)
-        loads_condensed = np.zeros_like(loads_vector)
-        loads_condensed[k_idx] = f_k_cond
-        # loads_condensed[r_idx] = 0
+        # Reuses the operator of calculate_kl for the same stiffness matrix
+        if kl_nr is self.kl_nr:
+            condensation = self.condensation
+        else:
+            condensation = stiffness.condensation(kl_nr[np.newaxis], release_mask[np.newaxis],
+                                                  tol)[0]
+
+        return condensation @ loads_vector
+
+
+def bars_loads_columns(bars: list[Bar], loads: list[Load],
+                       r3: NDArray[float64]) -> tuple[BarsPtLoads, BarsDistLoads]:
+    """Point and distributed loads of all bars and load cases in columns, in local coordinates
+
+    Args:
+        bars (list[Bar]): Bars
+        loads (list[Load]): Load cases
+        r3 (NDArray[float64]): Direction cosines of the bars (len(bars), 3, 3)
+
+    Returns:
+        tuple[BarsPtLoads, BarsDistLoads]: Point and distributed loads, with the indexes of the
+            load case and of the bar of each load. Loads in other bars are ignored.
+    """
+    bar_index = {bar: index for index, bar in enumerate(bars)}
+
+    # Lines of the loads: load case, bar, global system, positions and intensities in the
+    # order of vectorized.COMPONENTS (Fx, Fy, Fz, Mx, My, Mz)
+    point_loads: list[tuple] = []
+    distributed_loads: list[tuple] = []
+    for load_index, load in enumerate(loads):
+        for bar, bar_point_loads in load.bars_loads_pt.items():
+            if bar not in bar_index:
+                continue
+            for point in bar_point_loads.values():
+                point_loads.append((load_index, bar_index[bar], point['system'] == 'global',
+                                    point['position'], point['Fx'], point['Fy'], point['Fz'],
+                                    point['Mx'], point['My'], point['Mz']))
 
-        return loads_condensed
+        for bar, bar_distributed_loads in load.bars_loads_dist.items():
+            if bar not in bar_index:
+                continue
+            for distributed in bar_distributed_loads.values():
+                components = (distributed['Fx'], distributed['Fy'], distributed['Fz'],
+                              distributed['Mx'], distributed['My'], distributed['Mz'])
+                distributed_loads.append((load_index, bar_index[bar],
+                                          distributed['system'] == 'global',
+                                          distributed['x1'], distributed['x2'],
+                                          *(start for start, _ in components),
+                                          *(end for _, end in components)))
+
+    columns_loads = []
+    for table, positions in ((point_loads, 1), (distributed_loads, 2)):
+        columns = np.array(table, dtype=float64).reshape(len(table), 3 + 7 * positions)
+        load_indexes = columns[:, 0].astype(np.int64)
+        bar_indexes = columns[:, 1].astype(np.int64)
+        is_global = columns[:, 2] != 0
+
+        # Intensities (nloads, npositions, 6) in local coordinates
+        intensities = columns[:, 3 + positions:].reshape(len(table), positions, 6)
+        intensities[is_global] = rotation_functions.to_local(
+            intensities[is_global], r3[bar_indexes[is_global], np.newaxis])
+
+        columns_loads.append((load_indexes, bar_indexes,
+                              *columns[:, 3:3 + positions].T, *intensities.transpose(1, 0, 2)))
+
+    return BarsPtLoads(*columns_loads[0]), BarsDistLoads(*columns_loads[1])
+
+def bars_loads_vectors(bars: list[Bar], loads: list[Load],
+                       r3: NDArray[float64]) -> NDArray[float64]:
+    """Equivalent nodal loads in local coordinates without releases of all bars and load cases
+
+    The point and distributed loads of all bars and load cases are gathered in columns
+    (bars_loads_columns) and their reactions are calculated at once by the functions of
+    "reactions.vectorized".
+
+    Args:
+        bars (list[Bar]): Bars
+        loads (list[Load]): Load cases
+        r3 (NDArray[float64]): Direction cosines of the bars (len(bars), 3, 3)
+
+    Returns:
+        NDArray[float64]: Sum of the equivalent nodal loads (minus the fixed-end forces) of the
+            point and distributed loads (len(loads), len(bars), 12). Loads in other bars are
+            ignored.
+    """
+    lengths = np.array([bar.length for bar in bars], dtype=float64)
+    point_loads, distributed_loads = bars_loads_columns(bars, loads, r3)
+
+    # One line by load and component
+    component = np.tile(np.arange(6), (len(point_loads.position), 1)).ravel()
+    lines = np.repeat(point_loads.bar_index, 6)
+    point_reactions = vectorized.point_loads(
+        lengths[lines], np.repeat(point_loads.position, 6), point_loads.values.ravel(),
+        component)
+
+    component = np.tile(np.arange(6), (len(distributed_loads.x1), 1)).ravel()
+    lines = np.repeat(distributed_loads.bar_index, 6)
+    distributed_reactions = vectorized.trapezoidal_loads(
+        lengths[lines], np.repeat(distributed_loads.x1, 6), np.repeat(distributed_loads.x2, 6),
+        distributed_loads.p1.ravel(), distributed_loads.p2.ravel(), component)
+
+    loads_vectors = np.zeros([len(loads), len(bars), 12])
+    np.subtract.at(loads_vectors, (np.repeat(point_loads.load_index, 6),
+                                   np.repeat(point_loads.bar_index, 6)), point_reactions)
+    np.subtract.at(loads_vectors, (np.repeat(distributed_loads.load_index, 6),
+                                   np.repeat(distributed_loads.bar_index, 6)),
+                   distributed_reactions)
+
+    return loads_vectors
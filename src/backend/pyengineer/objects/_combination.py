@@ -0,0 +1,31 @@
+"""Combinações dos casos de carga"""
+from __future__ import annotations
+
+from ._load import Load
+
+
+class Combination:
+    """Combination of load cases (weighted sum of the results of the load cases)"""
+    name: str # Name of the combination
+    factors: dict[str, float] # Name of the load case -> factor
+
+    def __init__(self, name: str, factors: dict[str, float] | None = None):
+        """Combination of load cases
+
+        Args:
+            name (str): Name of the combination
+            factors (dict[str, float] | None, optional): Factors by name of the load case.
+                Defaults to None (no load case).
+        """
+        self.name = name
+        self.factors = {} if factors is None else dict(factors)
+
+    def add_load(self, load: Load | str, factor: float):
+        """Adds a load case to the combination
+
+        Args:
+            load (Load | str): Load case or its name
+            factor (float): Factor of the load case; repeated load cases are summed
+        """
+        name = load.name if isinstance(load, Load) else load
+        self.factors[name] = self.factors.get(name, 0.0) + factor
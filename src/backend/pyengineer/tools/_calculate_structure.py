@@ -1,15 +1,32 @@
 """Analysis structure in json file"""
+import hashlib
+
 from ..objects import Node
 from ..objects import Bar
 from ..objects import Material
 from ..objects import Section
 from ..objects import Support
 from ..objects import Load
+from ..objects import Combination
 from ..analysis import Linear
 
 from ..types import ReleasesType
 from ..types.structure import IStructure
 
+def structure_key(data: IStructure) -> str:
+    """Hash of the part of the structure that defines the stiffness (everything but the loads)
+
+    Args:
+        data (IStructure): Structure
+
+    Returns:
+        str: SHA-256 of the materials, sections, nodes, bars (with releases) and supports
+    """
+    stiffness = data.model_dump_json(include={'materials', 'sections', 'nodes', 'bars',
+                                              'supports'})
+    return hashlib.sha256(stiffness.encode('utf-8')).hexdigest()
+
+
 def calculate_structure_data(
     data: IStructure
     ) -> list[dict[str, str | list[dict[str, str | float]]]]:
@@ -18,8 +35,12 @@ def calculate_structure_data(
     Args:
         path (str): path to file
 
+    Raises:
+        ValueError: If a combination has the name of a load case
+
     Returns:
-        Linear: the result of linear analysis
+        Linear: the result of linear analysis, the load cases and then the combinations (field
+            'type': 'load_case' or 'combination')
     """
 
     # Create objects ///////////////////////////////////////////////////////////////////////////////
@@ -160,55 +181,22 @@ def calculate_structure_data(
                                                    dist_load.loads.Mz)
 
 
+    # Combinations *********************************************************************************
+    # The results of the combinations follow the load cases in the same list, so the names must
+    # not repeat the names of the load cases
+    loads_names = {load.name for load in loads}
+    repeated = [combination.name for combination in data.combinations
+                if combination.name in loads_names]
+    if repeated:
+        raise ValueError(f"Combination names repeat load case names: {', '.join(repeated)}")
+    combinations = [Combination(combination.name, combination.factors)
+                    for combination in data.combinations]
+
     # Analysis and return /////////////////////////////////////////////////////////////////////////
-    analysis = Linear(nodes, bars, loads, supports)
-    results: list[dict[str, str | list[dict[str, str | float]]]] = []
-
-    # Create dictionary structure for results *****************************************************
-    for index_load, load in enumerate(analysis.loads):
-        results.append({'load_case': load.name})
-        # Get displacements for each node under the current load case -----------------------------
-        displacements: list[dict[str, str | float]] = []
-        for node in analysis.nodes:
-            disp_vector = analysis.get_displacements(node.name, load.name)
-            displacements.append({'node': node.name,
-                                         'Dx': disp_vector[0],
-                                         'Dy': disp_vector[1],
-                                         'Dz': disp_vector[2],
-                                         'Rx': disp_vector[3],
-                                         'Ry': disp_vector[4],
-                                         'Rz': disp_vector[5]})
-        results[index_load]['displacements'] = displacements
-
-        # Get reactions for each support under the current load case -----------------------------
-        reactions: list[dict[str, str | float]] = []
-        for node in analysis.supports.nodes_support.keys():
-            reactions_vector = analysis.get_reactions(node.name, load.name)
-            reactions.append({'node': node.name,
-                              'Fx': reactions_vector[0],
-                              'Fy': reactions_vector[1],
-                              'Fz': reactions_vector[2],
-                              'Mx': reactions_vector[3],
-                              'My': reactions_vector[4],
-                              'Mz': reactions_vector[5]})
-        results[index_load]['reactions'] = reactions
-
-        # Get extreme forces for each bar under the current load case -----------------------------
-        extreme_forces: list[dict[str, str | float]] = []
-        for bar in analysis.bars:
-            forces_vector = bar.extreme_forces[load.name]
-            extreme_forces.append({'bar': bar.name,
-                                   'Fxi': forces_vector[0],
-                                   'Fyi': forces_vector[1],
-                                   'Fzi': forces_vector[2],
-                                   'Mxi': forces_vector[3],
-                                   'Myi': forces_vector[4],
-                                   'Mzi': forces_vector[5],
-                                   'Fxj': forces_vector[6],
-                                   'Fyj': forces_vector[7],
-                                   'Fzj': forces_vector[8],
-                                   'Mxj': forces_vector[9],
-                                   'Myj': forces_vector[10],
-                                   'Mzj': forces_vector[11]})
-        results[index_load]['extreme_forces'] = extreme_forces
-    return results
+    # Only the loads changed since a previous analysis: the factorization is reused
+    analysis = Linear(nodes, bars, loads, supports, structure_key=structure_key(data))
+    results = analysis.get_results()
+
+    # Each item says if it is a load case or a combination ('type')
+    return [{**result, 'type': 'load_case'} for result in results.to_list()] + \
+        [{**result, 'type': 'combination'} for result in results.combine(combinations).to_list()]
@@ -1,5 +1,9 @@
 """Typing"""
-from typing import TypedDict, Literal
+from typing import NamedTuple, TypedDict, Literal
+
+import numpy as np
+from numpy import float64
+from numpy.typing import NDArray
 
 ReleasesType = Literal['Dxi', 'Dyi', 'Dzi', 'Rxi', 'Ryi', 'Rzi',
                        'Dxj', 'Dyj', 'Dzj', 'Rxj', 'Ryj', 'Rzj']
@@ -14,3 +18,19 @@ class PtLoad(TypedDict):
     Mx: float      # Moment about X axis
     My: float      # Moment about Y axis
     Mz: float      # Moment about Z axis
+
+class BarsPtLoads(NamedTuple):
+    """Point loads of many bars and load cases in columns (local system)"""
+    load_index: NDArray[np.int64] # Load case of each load (n,)
+    bar_index: NDArray[np.int64] # Bar of each load (n,)
+    position: NDArray[float64] # Position of each load in the bar (n,)
+    values: NDArray[float64] # Fx, Fy, Fz, Mx, My, Mz of each load (n, 6)
+
+class BarsDistLoads(NamedTuple):
+    """Distributed loads of many bars and load cases in columns (local system)"""
+    load_index: NDArray[np.int64] # Load case of each load (n,)
+    bar_index: NDArray[np.int64] # Bar of each load (n,)
+    x1: NDArray[float64] # Start position of each load in the bar (n,)
+    x2: NDArray[float64] # End position of each load in the bar (n,)
+    p1: NDArray[float64] # Fx, Fy, Fz, Mx, My, Mz of each load at the start position (n, 6)
+    p2: NDArray[float64] # Fx, Fy, Fz, Mx, My, Mz of each load at the end position (n, 6)
@@ -125,6 +125,12 @@ class ILoad(BaseModel):
     nodes: list[INodeLoads]
     bars: IBarLoads
 
+# Combination Interface ///////////////////////////////////////////////////////////////////////////
+class ICombination(BaseModel):
+    """Interface for combinations of load cases"""
+    name: str
+    factors: dict[str, float] # Name of the load case -> factor
+
 # Structure Interface /////////////////////////////////////////////////////////////////////////////
 class IStructure(BaseModel):
     """Interface"""
@@ -134,3 +140,4 @@ class IStructure(BaseModel):
     bars: list[IBar]
     supports: list[ISupport]
     loads: list[ILoad]
+    combinations: list[ICombination] = []
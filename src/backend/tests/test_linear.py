@@ -0,0 +1,223 @@
+"""Tests of the linear analysis: solvers, extremes of the forces and deflected shape"""
+from typing import Literal
+
+import numpy as np
+import pytest
+
+import pyengineer as pg
+from pyengineer.analysis import Linear
+from pyengineer.functions.engineering import rotation
+
+# Options of the analyses compared with the baseline (dense matrix with the 1e25 penalty on the
+# supports, in the user DOF order)
+VARIANTS = [
+    {'solver': 'dense'},
+    {'solver': 'dense', 'renumber': False},
+    {'solver': 'dense', 'sparse': True},
+    {'solver': 'banded'},
+    {'solver': 'banded', 'partitioned': False},
+    {'solver': 'sparse_lu', 'sparse': True},
+    {'solver': 'sparse_lu', 'sparse': True, 'partitioned': False},
+    {'solver': 'sparse_cholesky', 'sparse': True},
+    {'solver': 'sparse_cholesky', 'sparse': True, 'partitioned': False},
+    {'solver': 'sparse_cholesky', 'sparse': True, 'renumber': False},
+    {'solver': 'pcg', 'sparse': True},
+]
+
+# Systems of the loads of the bars
+SYSTEMS: tuple[Literal['local', 'global'], ...] = ('local', 'global')
+
+
+def frame(seed: int = 0) -> tuple[list[pg.Node], list[pg.Bar], list[pg.Load], pg.Support]:
+    """Frame of 3 x 2 x 3 nodes with releases, springs and all the types of loads
+
+    Args:
+        seed (int, optional): Seed of the random loads. Defaults to 0.
+
+    Returns:
+        tuple[list[pg.Node], list[pg.Bar], list[pg.Load], pg.Support]: Nodes, bars, loads and
+            supports
+    """
+    rng = np.random.default_rng(seed)
+    material = pg.Material('steel', 2e11, 7.692308e10, 0.3, 7850)
+    sections = [pg.Section('w150x13', area=1.63e-3, ix=1.39e-8, iy=6.2e-6, iz=8.28e-7),
+                pg.Section('w200x22', area=3e-3, ix=5e-8, iy=9e-6, iz=2e-6)]
+
+    grid = {(i, j, k): pg.Node(f'N{i}{j}{k}', [4.0 * i, 3.0 * j, 3.5 * k])
+            for i in range(3) for j in range(2) for k in range(3)}
+    bars: list[pg.Bar] = []
+    for (i, j, k), node in grid.items():
+        for di, dj, dk in ((1, 0, 0), (0, 1, 0), (0, 0, 1)):
+            if (i + di, j + dj, k + dk) in grid:
+                bars.append(pg.Bar(f'B{len(bars)}', node, grid[(i + di, j + dj, k + dk)],
+                                   sections[len(bars) % 2], material,
+                                   float(rng.choice([0, 30, 90]))))
+    bars.append(pg.Bar('BD', grid[(0, 0, 1)], grid[(1, 1, 2)], sections[0], material, 15))
+    for bar in bars[::5]:
+        bar.releases['Ryj'] = True
+        bar.releases['Rzj'] = True
+
+    supports = pg.Support()
+    for (i, j, k), node in grid.items():
+        if k == 0 and (i + j) % 3 == 1:
+            supports.add_support(node, True, True, True, 1e6, False, 2e5)
+        elif k == 0:
+            supports.add_fixed_support(node)
+
+    loads = []
+    nodes = list(grid.values())
+    for index in range(3):
+        load = pg.Load(f'L{index}')
+        for number in range(3):
+            load.add_node_load(f'F{number}', nodes[rng.integers(len(nodes))],
+                               *rng.normal(0, 1e3, 6))
+        for number, system in enumerate(SYSTEMS):
+            bar = bars[rng.integers(len(bars))]
+            load.add_bar_load_pt(f'P{number}', bar, float(rng.uniform(0, bar.length)), system,
+                                 *rng.normal(0, 1e3, 6))
+        for number, system in enumerate(SYSTEMS):
+            bar = bars[rng.integers(len(bars))]
+            x1, x2 = sorted(rng.uniform(0, bar.length, 2))
+            load.add_bar_load_dist(f'D{number}', bar, float(x1), float(x2), system,
+                                   *[tuple(values) for values in rng.normal(0, 1e3, (6, 2))])
+        loads.append(load)
+
+    return nodes, bars, loads, supports
+
+def simple_beam(length: float = 6.0) -> tuple[Linear, float]:
+    """Simply supported beam along x with a uniform load in 2/3 of the span (L1) and the whole
+    span (L2), both of 1 kN/m in -z
+
+    Args:
+        length (float, optional): Span. Defaults to 6.0.
+
+    Returns:
+        tuple[Linear, float]: Analysis and EIy of the beam
+    """
+    material = pg.Material('steel', 2e11, 7.692308e10, 0.3, 7850)
+    section = pg.Section('w150x13', area=1.63e-3, ix=1.39e-8, iy=6.2e-6, iz=8.28e-7)
+    start, end = pg.Node('A', [0, 0, 0]), pg.Node('B', [length, 0, 0])
+    bar = pg.Bar('B1', start, end, section, material)
+
+    partial = pg.Load('L1')
+    partial.add_bar_load_dist('q', bar, 0.0, 2 * length / 3, 'global', fz=(-1e3, -1e3))
+    uniform = pg.Load('L2')
+    uniform.add_bar_load_dist('q', bar, 0.0, length, 'global', fz=(-1e3, -1e3))
+
+    supports = pg.Support()
+    supports.add_support(start, True, True, True, True, False, False)
+    supports.add_support(end, False, True, True, False, False, False)
+
+    return Linear([start, end], [bar], [partial, uniform], supports), 2e11 * 6.2e-6
+
+def relative_error(values: np.ndarray, reference: np.ndarray) -> float:
+    """Maximum difference relative to the largest value of the reference"""
+    return float(np.abs(values - reference).max() / np.abs(reference).max())
+
+
+@pytest.fixture(scope='module', name='baseline')
+def fixture_baseline() -> Linear:
+    """Analysis of the frame by the baseline: dense penalty, no renumbering"""
+    return Linear(*frame(), sparse=False, solver='dense', partitioned=False, renumber=False)
+
+
+@pytest.mark.parametrize('options', VARIANTS, ids=lambda options: '-'.join(
+    f'{name}={value}' for name, value in options.items()))
+def test_solvers_match_the_baseline(baseline: Linear, options: dict) -> None:
+    """Solvers, partitioned supports and renumbering give the results of the baseline"""
+    analysis = Linear(*frame(), **options)
+
+    assert relative_error(analysis.displacements, baseline.displacements) < 1e-8
+    assert relative_error(analysis.reactions, baseline.reactions) < 1e-8
+    assert relative_error(analysis.bars_forces, baseline.bars_forces) < 1e-8
+
+def test_equilibrium(baseline: Linear) -> None:
+    """K·u - f are the reactions, null in the nodes without supports"""
+    kg = baseline.kg.toarray() if hasattr(baseline.kg, 'toarray') else baseline.kg
+    residual = kg @ baseline.displacements - baseline.forces_vector - baseline.reactions
+    assert np.abs(residual).max() < 1e-8 * np.abs(baseline.forces_vector).max()
+
+    supported = np.zeros(baseline.matrix_order, dtype=bool)
+    for node in baseline.supports.nodes_support:
+        index = baseline.nodes.index(node)
+        supported[6 * index:6 * index + 6] = True
+    assert np.abs(baseline.reactions[~supported]).max() < \
+        1e-8 * np.abs(baseline.forces_vector).max()
+
+def test_extremes_bound_dense_sampling(baseline: Linear) -> None:
+    """The exact extremes bound the forces at 4001 stations of both sides of the loads"""
+    response = baseline.calculate_member_response()
+    maximum, maximum_position, minimum, minimum_position = response.get_extremes()
+
+    lengths = np.array([bar.length for bar in baseline.bars])
+    positions = lengths[:, np.newaxis] * np.linspace(0, 1, 4001)
+    right = response.get_forces(positions, 'right')
+    left = response.get_forces(positions, 'left')
+    scale = np.maximum(np.abs(right).max(axis=2), 1e-9)
+
+    # No sampled value is beyond the extremes and the sampling comes close to them
+    sampled_maximum = np.maximum(right.max(axis=2), left.max(axis=2))
+    sampled_minimum = np.minimum(right.min(axis=2), left.min(axis=2))
+    assert np.all(sampled_maximum <= maximum + 1e-9 * scale)
+    assert np.all(sampled_minimum >= minimum - 1e-9 * scale)
+    assert np.all(maximum - sampled_maximum < 1e-3 * scale)
+    assert np.all(sampled_minimum - minimum < 1e-3 * scale)
+
+    # The extremes are the values at their positions (on one side of a load)
+    for extreme, position in ((maximum, maximum_position), (minimum, minimum_position)):
+        for load_index in range(len(baseline.loads)):
+            for component in range(6):
+                stations = position[load_index][:, [component]]
+                values = np.stack([
+                    response.get_forces(stations, side)[load_index, :, 0, component]
+                    for side in ('left', 'right')])
+                error = np.abs(values - extreme[load_index, :, component]).min(axis=0)
+                assert np.all(error <= 1e-9 * scale[load_index, :, component])
+
+def test_extremes_of_simple_beam() -> None:
+    """Maximum moments of the simply supported beam at positions that are not stations"""
+    analysis, _ = simple_beam()
+    maximum, maximum_position, _, _ = analysis.calculate_member_response().get_extremes()
+
+    # Partial load: reaction R = q·a·(L - a/2)/L and maximum moment R²/(2q) at R/q
+    reaction = 1e3 * 4.0 * 4.0 / 6.0
+    assert maximum[0, 0, 4] == pytest.approx(reaction**2 / 2e3, rel=1e-12)
+    assert maximum_position[0, 0, 4] == pytest.approx(reaction / 1e3, rel=1e-12)
+
+    # Uniform load: q·L²/8 at the middle of the span
+    assert maximum[1, 0, 4] == pytest.approx(1e3 * 6.0**2 / 8, rel=1e-12)
+    assert maximum_position[1, 0, 4] == pytest.approx(3.0, rel=1e-12)
+
+def test_deflections_match_the_nodes(baseline: Linear) -> None:
+    """The deflections at the ends of the bars are the translations of the nodes"""
+    positions, shape = baseline.calculate_deflected_shape(7)
+
+    # Translations of the nodes (len(loads), nbars, 3)
+    nodes_displacements = baseline.displacements.reshape(len(baseline.nodes), 6, -1)
+    start = [baseline.nodes.index(bar.start_node) for bar in baseline.bars]
+    end = [baseline.nodes.index(bar.end_node) for bar in baseline.bars]
+    start_translations = np.moveaxis(nodes_displacements[start, :3], -1, 0)
+    end_translations = np.moveaxis(nodes_displacements[end, :3], -1, 0)
+
+    # Deflected shape in global axes (float32)
+    assert relative_error(shape[:, :, 0], start_translations) < 1e-6
+    assert relative_error(shape[:, :, -1], end_translations) < 1e-6
+
+    # Piecewise deflections in local axes
+    deflections = baseline.calculate_member_response().get_deflections(positions[:, [0, -1]])
+    assert relative_error(deflections[:, :, 0],
+                          rotation.to_local(start_translations, baseline.r3)) < 1e-9
+    assert relative_error(deflections[:, :, 1],
+                          rotation.to_local(end_translations, baseline.r3)) < 1e-9
+
+def test_deflection_of_simple_beam() -> None:
+    """Deflection of the simply supported beam at the middle of the span"""
+    analysis, rigidity = simple_beam()
+    middle = np.array([[3.0]])
+
+    # Uniform load: 5·q·L⁴ / (384·EI) at the middle of the span
+    expected = 5 * 1e3 * 6.0**4 / (384 * rigidity)
+    deflections = analysis.calculate_member_response().get_deflections(middle)
+    _, shape = analysis.calculate_deflected_shape(positions=middle)
+    assert deflections[1, 0, 0, 2] == pytest.approx(-expected, rel=1e-12)
+    assert shape[1, 0, 0, 2] == pytest.approx(-expected, rel=1e-6)
@@ -117,6 +117,7 @@ export type forcesType = 'Fx' | 'Fy' | 'Fz' | 'Mx' | 'My' | 'Mz'
 // Results ////////////////////////////////////////////////////////////////////////////////////////
 export interface IResultsData {
 	load_case: string
+	type?: 'load_case' | 'combination'
 	displacements: IDisplacementResultsData[]
 	reactions: IReactionsData[]
 	extreme_forces: IExtremeForcesData[]